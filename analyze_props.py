@@ -1,87 +1,107 @@
 from props_manager import PropsManager
 from datetime import datetime
 import json
+import os
+import sys
+
+def _quiet():
+    """QUIET=1 drops the detailed listings when output isn't a terminal (cron, CI)"""
+    return bool(os.environ.get("QUIET")) and not sys.stdout.isatty()
+
+def _emit(lines):
+    """Write a whole block at once instead of one print per line"""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def display_arbitrage_opportunities(arbs):
     """Display arbitrage opportunities in a readable format"""
+    if _quiet():
+        return
     if not arbs:
         print("No arbitrage opportunities found.")
         return
     
-    print(f"\n{'='*100}")
-    print(f"ARBITRAGE OPPORTUNITIES (Guaranteed Profit)")
-    print(f"{'='*100}\n")
+    lines = [
+        f"\n{'='*100}",
+        f"ARBITRAGE OPPORTUNITIES (Guaranteed Profit)",
+        f"{'='*100}\n",
+    ]
     
     for i, arb in enumerate(arbs, 1):
-        print(f"{i}. {arb['player'].title()} - {arb['prop_type'].upper()} {arb['line']}")
-        print(f"   Game: {arb['game']}")
-        print(f"   📈 PROFIT: {arb['profit_percent']:.2f}%")
-        print(f"   ")
-        print(f"   Bet OVER {arb['line']} on {arb['bet_over']}: {arb['over_odds']:+d}")
-        print(f"   Bet UNDER {arb['line']} on {arb['bet_under']}: {arb['under_odds']:+d}")
-        print(f"   ")
-        print(f"   Example: Stake $100 total")
-        
-        # Calculate stake distribution for arbitrage
-        from props_manager import american_to_decimal
-        dec_over = american_to_decimal(arb['over_odds'])
-        dec_under = american_to_decimal(arb['under_odds'])
-        
-        total_stake = 100
-        stake_over = total_stake / (1 + (dec_over / dec_under))
-        stake_under = total_stake - stake_over
-        
-        profit = (stake_over * dec_over) - total_stake
-        
-        print(f"   → Stake ${stake_over:.2f} on OVER")
-        print(f"   → Stake ${stake_under:.2f} on UNDER")
-        print(f"   → Guaranteed profit: ${profit:.2f}")
-        print()
+        # Stake split per $100 is worked out once by the arbitrage scan
+        lines += [
+            f"{i}. {arb['player'].title()} - {arb['prop_type'].upper()} {arb['line']}",
+            f"   Game: {arb['game']}",
+            f"   📈 PROFIT: {arb['profit_percent']:.2f}%",
+            f"   ",
+            f"   Bet OVER {arb['line']} on {arb['bet_over']}: {arb['over_odds']:+d}",
+            f"   Bet UNDER {arb['line']} on {arb['bet_under']}: {arb['under_odds']:+d}",
+            f"   ",
+            f"   Example: Stake $100 total",
+            f"   → Stake ${arb['stake_over']:.2f} on OVER",
+            f"   → Stake ${arb['stake_under']:.2f} on UNDER",
+            f"   → Guaranteed profit: ${arb['stake_profit']:.2f}",
+            "",
+        ]
+    _emit(lines)
 
 def display_line_discrepancies(discrepancies):
     """Display line discrepancies"""
+    if _quiet():
+        return
     if not discrepancies:
         print("No significant line discrepancies found.")
         return
     
-    print(f"\n{'='*100}")
-    print(f"LINE DISCREPANCIES (Different Lines Across Books)")
-    print(f"{'='*100}\n")
+    lines = [
+        f"\n{'='*100}",
+        f"LINE DISCREPANCIES (Different Lines Across Books)",
+        f"{'='*100}\n",
+    ]
     
     for i, disc in enumerate(discrepancies, 1):
-        print(f"{i}. {disc['player'].title()} - {disc['prop_type'].upper()}")
-        print(f"   Game: {disc['game']}")
-        print(f"   📊 Line Difference: {disc['line_difference']:.1f}")
-        print(f"   ")
-        print(f"   DraftKings: {disc['dk_line']} (O: {disc['dk_over']:+d}, U: {disc['dk_under']:+d})")
-        print(f"   FanDuel:    {disc['fd_line']} (O: {disc['fd_over']:+d}, U: {disc['fd_under']:+d})")
-        print(f"   ")
+        lines += [
+            f"{i}. {disc['player'].title()} - {disc['prop_type'].upper()}",
+            f"   Game: {disc['game']}",
+            f"   📊 Line Difference: {disc['line_difference']:.1f}",
+            f"   ",
+            f"   DraftKings: {disc['dk_line']} (O: {disc['dk_over']:+d}, U: {disc['dk_under']:+d})",
+            f"   FanDuel:    {disc['fd_line']} (O: {disc['fd_over']:+d}, U: {disc['fd_under']:+d})",
+            f"   ",
+        ]
         
         # Suggest strategy
         if disc['dk_line'] < disc['fd_line']:
-            print(f"   💡 Strategy: Consider DK OVER {disc['dk_line']} or FD UNDER {disc['fd_line']}")
+            lines.append(f"   💡 Strategy: Consider DK OVER {disc['dk_line']} or FD UNDER {disc['fd_line']}")
         else:
-            print(f"   💡 Strategy: Consider FD OVER {disc['fd_line']} or DK UNDER {disc['dk_line']}")
-        print()
+            lines.append(f"   💡 Strategy: Consider FD OVER {disc['fd_line']} or DK UNDER {disc['dk_line']}")
+        lines.append("")
+    _emit(lines)
 
 def display_best_odds(best_odds):
     """Display best odds opportunities"""
+    if _quiet():
+        return
     if not best_odds:
         print("No significant odds differences found.")
         return
     
-    print(f"\n{'='*100}")
-    print(f"BEST ODDS (Same Line, Better Odds)")
-    print(f"{'='*100}\n")
+    lines = [
+        f"\n{'='*100}",
+        f"BEST ODDS (Same Line, Better Odds)",
+        f"{'='*100}\n",
+    ]
     
     for i, odds in enumerate(best_odds[:20], 1):  # Show top 20
-        print(f"{i}. {odds['player'].title()} - {odds['prop_type'].upper()} {odds['side']} {odds['line']}")
-        print(f"   Game: {odds['game']}")
-        print(f"   💰 Odds Difference: {odds['odds_difference']} points")
-        print(f"   ")
-        print(f"   ✅ Best: {odds['best_book']} at {odds['best_odds']:+d}")
-        print(f"   ❌ Other: {odds['other_odds']:+d}")
-        print()
+        lines += [
+            f"{i}. {odds['player'].title()} - {odds['prop_type'].upper()} {odds['side']} {odds['line']}",
+            f"   Game: {odds['game']}",
+            f"   💰 Odds Difference: {odds['odds_difference']} points",
+            f"   ",
+            f"   ✅ Best: {odds['best_book']} at {odds['best_odds']:+d}",
+            f"   ❌ Other: {odds['other_odds']:+d}",
+            "",
+        ]
+    _emit(lines)
 
 def main():
     manager = PropsManager(base_folder="props_data", use_db=True)
@@ -1,153 +1,366 @@
 # dashboard_api.py
-from flask import Flask, jsonify, Response
+from flask import Flask, jsonify, Response, request, stream_with_context
 from flask_cors import CORS
-from props_manager import PropsManager
+from props_manager import PropsManager, ensure_dir
+import run_all_scrapers
 from datetime import datetime
-import subprocess # <-- Import subprocess
-import sys # <-- Import sys to get Python executable path
-import os # <-- Import os to check script path
+import atexit
+import functools
+import gzip
+import os
+import threading
+import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: no gunicorn there either, so only one process
+    fcntl = None
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
+# One manager for the whole app; PropsDatabase keeps a connection per thread,
+# so requests reuse an open (and page-cache warm) SQLite handle. The API only
+# reads, so its connections are opened query-only.
+MANAGER = PropsManager(base_folder="props_data", use_db=True, read_only=True)
+atexit.register(MANAGER.close)
+
+# Shared by every /api/dashboard call to run its analyses side by side
+DASHBOARD_EXECUTOR = ThreadPoolExecutor(max_workers=5, thread_name_prefix="dashboard")
+
+def json_response(obj, status=200):
+    """JSON response encoded with orjson (much faster than jsonify on big prop lists)"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+# --- Compression ---
+# Prop payloads repeat the same keys thousands of times and shrink 5-10x.
+# Level 1 gets most of that ratio for almost no CPU.
+GZIP_LEVEL = 1
+GZIP_MIN_BYTES = 1024
+
+def _wants_gzip(body):
+    return len(body) >= GZIP_MIN_BYTES and request.accept_encodings['gzip'] > 0
+
+def _gzipped(response):
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Gzip buffered JSON responses for clients that accept it"""
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or response.mimetype != 'application/json' or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if _wants_gzip(body):
+        response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+        _gzipped(response)
+    return response
+
+# --- Response Cache ---
+# The data only changes when the scrapers run, but the dashboard polls every
+# route on a timer. Successful JSON bodies are kept for a short TTL, keyed by
+# (endpoint, date), and dropped whenever a scrape finishes.
+CACHE_TTL_SECONDS = 60
+CACHE_MAX_ENTRIES = 256
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+
+def cached_json(ttl=CACHE_TTL_SECONDS):
+    """Serve a route's JSON body from memory for `ttl` seconds after it is built"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            key = (view.__name__, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            _sync_response_cache()
+            with _response_cache_lock:
+                entry = _response_cache.get(key)
+            if entry and entry['expires'] > now:
+                if _wants_gzip(entry['body']):
+                    # Compress a cached body at most once, not on every hit
+                    if entry['gzip'] is None:
+                        entry['gzip'] = gzip.compress(entry['body'], compresslevel=GZIP_LEVEL)
+                    return _gzipped(Response(entry['gzip'], mimetype='application/json'))
+                return Response(entry['body'], mimetype='application/json')
+            
+            response = app.make_response(view(**kwargs))
+            if response.status_code == 200:  # Never cache errors
+                with _response_cache_lock:
+                    if len(_response_cache) >= CACHE_MAX_ENTRIES:
+                        for stale_key in [k for k, v in _response_cache.items() if v['expires'] <= now]:
+                            del _response_cache[stale_key]
+                        if len(_response_cache) >= CACHE_MAX_ENTRIES:
+                            _response_cache.clear()
+                    _response_cache[key] = {'expires': now + ttl, 'body': response.get_data(), 'gzip': None}
+            return response
+        return wrapper
+    return decorator
+
+def clear_response_cache():
+    """Drop every cached body so the next poll re-reads the database"""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+# Scrape status as of this worker's cached bodies. Whichever worker runs a
+# scrape rewrites the status file, so a changed mtime means every other
+# worker's bodies may be stale too.
+_seen_status_mtime = None
+
+def _sync_response_cache():
+    """Clear this worker's response cache once any worker's scrape updated the status file"""
+    global _seen_status_mtime
+    try:
+        mtime = os.stat(SCRAPE_STATUS_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime != _seen_status_mtime:
+        clear_response_cache()
+        _seen_status_mtime = mtime
+
+def precomputed(endpoint):
+    """Serve the payload stored at scrape time, falling back to the live view"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(date):
+            try:
+                body = MANAGER.get_dashboard_payload(date, endpoint)
+            except Exception as e:
+                print(f"Error reading precomputed {endpoint} for {date}: {e}")
+                body = None
+            if body is not None:
+                return Response(body, mimetype='application/json')
+            return view(date)
+        return wrapper
+    return decorator
+
+
 # --- Data Fetching Routes ---
+def _ndjson_iter(rows):
+    """Encode rows as newline-delimited JSON, one chunk per row"""
+    for row in rows:
+        yield orjson.dumps(row) + b"\n"
+
 @app.route('/api/props/<date>')
 def get_props(date):
-    manager = PropsManager(base_folder="props_data", use_db=True)
+    # Clients that ask for NDJSON get rows streamed straight off the DB cursor,
+    # so the full list is never built; everyone else gets the cached JSON array
+    wanted = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    if wanted == 'application/x-ndjson':
+        rows = MANAGER.iter_all_props_comparison(date)
+        return Response(stream_with_context(_ndjson_iter(rows)), mimetype='application/x-ndjson')
+    return get_props_json(date=date)
+
+@cached_json()
+def get_props_json(date):
     try:
-        props = manager.get_all_props_comparison(date)
-        return jsonify(props)
+        props = MANAGER.get_all_props_comparison(date)
+        return json_response(props)
     except Exception as e:
         print(f"Error in /api/props/{date}: {e}")
         return jsonify({"error": "Failed to fetch props data"}), 500
-    finally:
-        manager.close()
 
 
 @app.route('/api/arbitrage/<date>')
+@cached_json()
+@precomputed('arbitrage')
 def get_arbitrage(date):
-    manager = PropsManager(base_folder="props_data", use_db=True)
     try:
-        arbs = manager.find_arbitrage(date, min_profit=0.1)
-        return jsonify(arbs)
+        arbs = MANAGER.find_arbitrage(date, min_profit=0.1)
+        return json_response(arbs)
     except Exception as e:
         print(f"Error in /api/arbitrage/{date}: {e}")
         return jsonify({"error": "Failed to fetch arbitrage data"}), 500
-    finally:
-        manager.close()
 
 
 @app.route('/api/discrepancies/<date>')
+@cached_json()
+@precomputed('discrepancies')
 def get_discrepancies(date):
-    manager = PropsManager(base_folder="props_data", use_db=True)
     try:
-        disc = manager.find_line_discrepancies(date, min_diff=0.5)
-        return jsonify(disc)
+        disc = MANAGER.find_line_discrepancies(date, min_diff=0.5)
+        return json_response(disc)
     except Exception as e:
         print(f"Error in /api/discrepancies/{date}: {e}")
         return jsonify({"error": "Failed to fetch discrepancies data"}), 500
-    finally:
-        manager.close()
 
 
 @app.route('/api/best-odds/<date>')
+@cached_json()
+@precomputed('best_odds')
 def get_best_odds(date):
-    manager = PropsManager(base_folder="props_data", use_db=True)
     try:
         # This now finds bets where one side is + and other is -
-        odds = manager.find_best_odds(date, min_odds_diff=5)
-        return jsonify(odds)
+        odds = MANAGER.find_best_odds(date, min_odds_diff=5)
+        return json_response(odds)
     except Exception as e:
         print(f"Error in /api/best-odds/{date}: {e}")
         return jsonify({"error": "Failed to fetch best odds data"}), 500
-    finally:
-        manager.close()
 
 
 @app.route('/api/value-bets/<date>')
+@cached_json()
+@precomputed('value_bets')
 def get_value_bets(date):
-    manager = PropsManager(base_folder="props_data", use_db=True)
     try:
         # This finds bets with the largest odds disagreement, regardless of +/-
-        value_bets = manager.find_value_bets(date, min_edge=1.5, min_odds_diff=20)
-        return jsonify(value_bets)
+        value_bets = MANAGER.find_value_bets(date, min_edge=1.5, min_odds_diff=20)
+        return json_response(value_bets)
     except Exception as e:
         print(f"Error in /api/value-bets/{date}: {e}")
         return jsonify({"error": "Failed to fetch value bets data"}), 500
-    finally:
-        manager.close()
 
 # <-- MODIFIED API ENDPOINT -->
 @app.route('/api/consensus-bets/<date>')
+@cached_json()
+@precomputed('consensus_bets')
 def get_consensus_bets(date):
-    manager = PropsManager(base_folder="props_data", use_db=True)
     try:
         # Finds bets where both books favor a side, but one has a discount
         # MODIFIED: Changed min_odds_diff to 20 to match your manager file's new default
-        bets = manager.find_consensus_bets(date, min_odds_diff=20) 
-        return jsonify(bets)
+        bets = MANAGER.find_consensus_bets(date, min_odds_diff=20) 
+        return json_response(bets)
     except Exception as e:
         print(f"Error in /api/consensus-bets/{date}: {e}")
         return jsonify({"error": "Failed to fetch consensus bets data"}), 500
-    finally:
-        manager.close()
 
 
+@app.route('/api/dashboard/<date>')
+@cached_json()
+@precomputed('dashboard')
+def get_dashboard(date):
+    try:
+        # One query for the date; every analysis runs on that same snapshot
+        dashboard = MANAGER.get_dashboard(date, executor=DASHBOARD_EXECUTOR)
+        return json_response(dashboard)
+    except Exception as e:
+        print(f"Error in /api/dashboard/{date}: {e}")
+        return jsonify({"error": "Failed to fetch dashboard data"}), 500
+
+
+# (date, encoded body); only rebuilt when the day rolls over
+_today_response = ('', b'')
+
 @app.route('/api/today')
 def get_today():
+    global _today_response
     try:
-        return jsonify({'date': datetime.now().strftime('%Y-%m-%d')})
+        today = datetime.now().strftime('%Y-%m-%d')
+        if _today_response[0] != today:
+            _today_response = (today, orjson.dumps({'date': today}))
+        return Response(_today_response[1], mimetype='application/json')
     except Exception as e:
         print(f"Error in /api/today: {e}")
         return jsonify({"error": "Failed to get today's date"}), 500
 
 # --- Action Route to Trigger Scrapers ---
-@app.route('/api/trigger-scrape', methods=['POST']) # Use POST for actions
-def trigger_scrape():
-    # Assumes run_all_scrapers.py is in the same directory as dashboard_api.py
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    scraper_script_path = os.path.join(script_dir, "run_all_scrapers.py")
-    python_executable = sys.executable # Use the same python that runs Flask
+# Scrapes run in a background thread of whichever worker process got the POST.
+# Under gunicorn there are several workers, so the guard is an flock on a file
+# (only one scrape at a time across all of them; extra clicks just get
+# "already_running") and the status lives in a JSON file every worker reads.
+SCRAPE_LOCK_PATH = os.path.join("props_data", ".scrape.lock")
+SCRAPE_STATUS_PATH = os.path.join("props_data", "scrape_status.json")
+IDLE_SCRAPE_STATUS = {'running': False, 'started_at': None, 'finished_at': None,
+                      'results': None, 'error': None}
+_local_scrape_lock = threading.Lock()
 
-    print(f"[{datetime.now()}] API received request to trigger scrapers...")
-    print(f"Attempting to run: {python_executable} {scraper_script_path}")
+def _try_lock_scrape():
+    """Take the scrape lock without waiting; returns a handle for _unlock_scrape, or None if held"""
+    if fcntl is None:
+        return _local_scrape_lock if _local_scrape_lock.acquire(blocking=False) else None
+    ensure_dir(os.path.dirname(SCRAPE_LOCK_PATH))
+    lock_file = open(SCRAPE_LOCK_PATH, 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
 
-    if not os.path.exists(scraper_script_path):
-        print(f"Error: Scraper script '{scraper_script_path}' not found.")
-        return jsonify({"error": f"Scraper script not found: {scraper_script_path}"}), 500
+def _unlock_scrape(handle):
+    if handle is _local_scrape_lock:
+        handle.release()
+    else:
+        handle.close()  # Closing the file drops the flock
 
+def _write_scrape_status(status):
+    """Only the lock holder writes, so one temp name is enough"""
+    tmp_path = SCRAPE_STATUS_PATH + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(status))
+    os.replace(tmp_path, SCRAPE_STATUS_PATH)
+
+def _read_scrape_status():
     try:
-        # Run in the background (non-blocking) - API returns faster
-        print(f"Starting scraper script: {scraper_script_path}")
-        # MODIFIED: Use subprocess.run to make it a blocking call.
-        # The API will now wait for the script to finish.
-        # Added check=True to raise an exception if the script fails.
-        # Capture output to provide better feedback to the frontend.
-        result = subprocess.run(
-            [python_executable, scraper_script_path], 
-            capture_output=True, 
-            text=True, 
-            check=True
-        )
-        print(f"Scraper script finished successfully.")
-        print(f"STDOUT:\n{result.stdout}")
-        print(f"STDERR:\n{result.stderr}")
-        
-        # API returns after scraper is done
-        return jsonify({
-            "message": "Scraping and analysis complete.",
-            "output": result.stdout
-        }), 200
+        with open(SCRAPE_STATUS_PATH, 'rb') as f:
+            status = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return dict(IDLE_SCRAPE_STATUS)
+    if status.get('running'):
+        # A worker killed mid-scrape leaves running=True behind; if the lock
+        # is free, nobody is actually scraping
+        handle = _try_lock_scrape()
+        if handle is not None:
+            _unlock_scrape(handle)
+            status['running'] = False
+            status['error'] = status.get('error') or "Scrape was interrupted"
+    return status
 
+def _run_scrape(lock_handle, status):
+    try:
+        status['results'] = run_all_scrapers.main()
+        print(f"Scraper run finished.")
     except Exception as e:
-        print(f"An unexpected error occurred while trying to start scraper: {e}")
-        # Log the full exception for debugging
+        print(f"An unexpected error occurred while running scrapers: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({"error": f"Failed to start scraper process: {str(e)}"}), 500
+        status['error'] = str(e)
+    finally:
+        clear_response_cache()  # New data in the DB, stop serving old bodies
+        status['running'] = False
+        status['finished_at'] = datetime.now().isoformat()
+        try:
+            _write_scrape_status(status)  # Also tells the other workers to clear theirs
+        except OSError as e:
+            print(f"Failed to write scrape status: {e}")
+        _unlock_scrape(lock_handle)
+
+@app.route('/api/trigger-scrape', methods=['POST']) # Use POST for actions
+def trigger_scrape():
+    print(f"[{datetime.now()}] API received request to trigger scrapers...")
+
+    lock_handle = _try_lock_scrape()
+    if lock_handle is None:
+        return jsonify({"status": "already_running"}), 202
+
+    try:
+        status = dict(IDLE_SCRAPE_STATUS, running=True, started_at=datetime.now().isoformat())
+        _write_scrape_status(status)
+        threading.Thread(target=_run_scrape, args=(lock_handle, status), name="scraper", daemon=True).start()
+    except Exception as e:
+        _unlock_scrape(lock_handle)
+        print(f"Failed to start scraper thread: {e}")
+        return jsonify({"error": f"Failed to start scraper: {str(e)}"}), 500
+
+    # Returns right away; poll /api/scrape-status to see when it is done
+    return jsonify({"status": "started"}), 202
+
+
+@app.route('/api/scrape-status')
+def get_scrape_status():
+    status = _read_scrape_status()
+    if status['results'] is not None:
+        status['success'] = run_all_scrapers.any_succeeded(status['results'])
+    return jsonify(status)
 
 
 if __name__ == '__main__':
+    # Local fallback only. In production run it under gunicorn so requests
+    # are served in parallel:
+    #   gunicorn -w 2 --threads 8 -b 0.0.0.0:5000 dashboard_api:app
     # Use host='0.0.0.0' to make it accessible on your network if needed
-    # Use debug=False for production deployment
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=False, threaded=True, host='0.0.0.0', port=5000)
@@ -1,18 +1,25 @@
+"""
+One-shot migration: normalizes odds stored before the scrapers cleaned them
+at write time (unicode minus signs, odds saved as text).
+"""
 import sqlite3
 import os
+from props_manager import clean_odds_value, tune_connection
 
-def clean_odds_value(odds_value):
-    """Clean and convert odds value to integer"""
-    if odds_value is None:
-        return None
-    
-    odds_str = str(odds_value).strip()
-    odds_str = odds_str.replace('−', '-').replace('–', '-').replace('—', '-').replace('\u2212', '-')
-    
-    try:
-        return int(odds_str)
-    except (ValueError, TypeError):
-        return None
+PAGE_SIZE = 1000
+KEY_COLUMNS = ('player', 'prop_type', 'line', 'sportsbook', 'game_date')
+KEY_LIST = ', '.join(KEY_COLUMNS)
+UPDATE_SQL = (
+    "UPDATE player_props SET over_odds = ?, under_odds = ? WHERE "
+    + " AND ".join(f"{column} = ?" for column in KEY_COLUMNS)
+)
+# Pages walk the primary key; each one is read in full before its fixes are
+# written, so no UPDATE ever runs underneath an open SELECT on the table
+FIRST_PAGE_SQL = f"SELECT over_odds, under_odds, {KEY_LIST} FROM player_props ORDER BY {KEY_LIST} LIMIT ?"
+NEXT_PAGE_SQL = (
+    f"SELECT over_odds, under_odds, {KEY_LIST} FROM player_props "
+    f"WHERE ({KEY_LIST}) > ({', '.join('?' * len(KEY_COLUMNS))}) ORDER BY {KEY_LIST} LIMIT ?"
+)
 
 def fix_database_odds():
     db_path = "props_data/props.db"
@@ -21,31 +28,42 @@ def fix_database_odds():
         print(f"Database not found at {db_path}")
         return
     
-    conn = sqlite3.connect(db_path)
+    conn = tune_connection(sqlite3.connect(db_path, isolation_level=None))
     cursor = conn.cursor()
     
-    # Get all props
-    cursor.execute("SELECT id, over_odds, under_odds FROM player_props")
-    props = cursor.fetchall()
-    
-    print(f"Found {len(props)} props to check...")
+    # Scan and fix inside one write transaction, a page at a time instead of
+    # loading the whole table
+    cursor.execute("BEGIN IMMEDIATE")
     
+    checked = 0
     fixed = 0
-    for prop_id, over_odds, under_odds in props:
-        cleaned_over = clean_odds_value(over_odds)
-        cleaned_under = clean_odds_value(under_odds)
-        
-        # Only update if values changed
-        if cleaned_over != over_odds or cleaned_under != under_odds:
-            cursor.execute(
-                "UPDATE player_props SET over_odds = ?, under_odds = ? WHERE id = ?",
-                (cleaned_over, cleaned_under, prop_id)
-            )
-            fixed += 1
+    rows = cursor.execute(FIRST_PAGE_SQL, (PAGE_SIZE,)).fetchall()
+    while rows:
+        checked += len(rows)
+        updates = []
+        for over_odds, under_odds, *key in rows:
+            cleaned_over = clean_odds_value(over_odds)
+            cleaned_under = clean_odds_value(under_odds)
+            
+            # Only update if values changed
+            if cleaned_over != over_odds or cleaned_under != under_odds:
+                updates.append((cleaned_over, cleaned_under, *key))
+        if updates:
+            cursor.executemany(UPDATE_SQL, updates)
+            fixed += len(updates)
+        # Only the odds change, so the keys still order the same way
+        rows = cursor.execute(NEXT_PAGE_SQL, (*rows[-1][2:], PAGE_SIZE)).fetchall()
     
+    if fixed:
+        try:
+            # Precomputed analytics were built from the bad odds
+            cursor.execute("DELETE FROM dashboard_cache")
+        except sqlite3.OperationalError:
+            pass  # Database predates the cache table
     conn.commit()
     conn.close()
     
+    print(f"Checked {checked} props...")
     print(f"Fixed {fixed} props with incorrect odds formatting")
     print("Database cleaned successfully!")
 
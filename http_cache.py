@@ -0,0 +1,138 @@
+"""
+On-disk response cache for the scrapers. Bodies are stored per URL, with the
+time they were fetched and the server's ETag / Last-Modified validators:
+- within a caller-given TTL the stored body is reused without any request
+- after it, the validators turn an unchanged page into a 304 that is read
+  back from disk instead of being downloaded again
+Also holds the retry policy mounted on both scrapers' sessions.
+"""
+import hashlib
+import os
+import threading
+import time
+import orjson
+from urllib3.util.retry import Retry
+from props_manager import ensure_dir
+
+CACHE_ROOT = os.path.join("props_data", ".http_cache")
+# Mounted on the scrapers' HTTPAdapters: rate limits, 5xx and dropped
+# connections are retried with exponential backoff (0.5s, 1s, 2s, ...) instead
+# of losing the whole category or tab. Retry-After is ignored, since a large
+# value would stall a fetch thread (and hold the API's scrape lock) for minutes.
+RETRY = Retry(total=4, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+              allowed_methods=('GET',), raise_on_status=False, respect_retry_after_header=False)
+
+# Entries not fetched again for this long (finished games, old event ids)
+# are dropped with their bodies when the index is saved
+MAX_ENTRY_AGE = 2 * 24 * 3600
+
+class HttpCache:
+    def __init__(self, name, cache_root=CACHE_ROOT):
+        # One cache per scraper, so scrapers running at once never save over
+        # each other's index
+        self.cache_dir = os.path.join(cache_root, name)
+        self.index_path = self.cache_dir + ".json"
+        # Fetches run on several threads at once
+        self._lock = threading.Lock()
+        try:
+            with open(self.index_path, 'rb') as f:
+                self.index = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            self.index = {}
+
+    def _body_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def _read_body(self, url):
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get(self, session, url, headers=None, timeout=None, ttl=0):
+        """
+        session.get through the cache; ttl is how many seconds a stored body
+        is reused without asking the server at all.
+        Returns (body bytes, from_cache); raises like response.raise_for_status().
+        """
+        with self._lock:
+            entry = self.index.get(url)
+        request_headers = dict(headers or {})
+        if entry:
+            if ttl and time.time() - entry.get('fetched_at', 0) < ttl:
+                body = self._read_body(url)
+                if body is not None:
+                    return body, True
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(url, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and entry:
+            body = self._read_body(url)
+            with self._lock:
+                if body is None:
+                    # Body went missing; fetch it again without validators
+                    self.index.pop(url, None)
+                else:
+                    entry['fetched_at'] = time.time()
+            if body is None:
+                return self.get(session, url, headers, timeout, ttl)
+            return body, True
+        response.raise_for_status()
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        with self._lock:
+            # Nothing to reuse next time unless stored below
+            self.index.pop(url, None)
+        if ttl or etag or last_modified:
+            # Bodies can be several MB; write them outside the lock so the
+            # other fetch threads aren't queued behind this disk write
+            try:
+                ensure_dir(self.cache_dir)
+                body_path = self._body_path(url)
+                tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(response.content)
+                os.replace(tmp_path, body_path)
+            except OSError as e:
+                print(f"  Warning: could not cache response for {url}: {e}")
+            else:
+                with self._lock:
+                    self.index[url] = {'etag': etag, 'last_modified': last_modified,
+                                       'fetched_at': time.time()}
+        return response.content, False
+
+    def save(self):
+        """Persist the index for the next run, evicting entries older than MAX_ENTRY_AGE"""
+        cutoff = time.time() - MAX_ENTRY_AGE
+        with self._lock:
+            for url in [url for url, entry in self.index.items() if entry.get('fetched_at', 0) < cutoff]:
+                del self.index[url]
+            kept_bodies = {os.path.basename(self._body_path(url)) for url in self.index}
+            try:
+                ensure_dir(os.path.dirname(self.index_path))
+                with open(self.index_path + ".tmp", 'wb') as f:
+                    f.write(orjson.dumps(self.index))
+                os.replace(self.index_path + ".tmp", self.index_path)
+            except OSError as e:
+                print(f"  Warning: could not save HTTP cache index: {e}")
+        self._remove_stale_bodies(kept_bodies, cutoff)
+    
+    def _remove_stale_bodies(self, kept_bodies, cutoff):
+        """Unlink bodies no index entry points at (evicted, or left by a crash) once they are old"""
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name in kept_bodies:
+                        continue
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                    except OSError:
+                        pass  # Gone already, or not ours to remove
+        except OSError:
+            pass  # Nothing cached yet
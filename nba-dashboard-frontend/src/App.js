@@ -81,32 +81,21 @@ const NBAPropsDashboard = () => {
     setLoading(true);
     setError(null); // Clear previous errors
     try {
-      const [propsRes, arbRes, discRes, oddsRes, valueRes, consensusRes] = await Promise.all([
-        fetch(`${API_BASE}/props/${selectedDate}`),
-        fetch(`${API_BASE}/arbitrage/${selectedDate}`),
-        fetch(`${API_BASE}/discrepancies/${selectedDate}`),
-        fetch(`${API_BASE}/best-odds/${selectedDate}`),
-        fetch(`${API_BASE}/value-bets/${selectedDate}`),
-        fetch(`${API_BASE}/consensus-bets/${selectedDate}`)
-      ]);
+      // One batched request instead of six separate endpoint calls
+      const dashboardRes = await fetch(`${API_BASE}/dashboard/${selectedDate}`);
 
-      if (!propsRes.ok || !arbRes.ok || !discRes.ok || !oddsRes.ok || !valueRes.ok || !consensusRes.ok) {
-        throw new Error('One or more API endpoints failed');
+      if (!dashboardRes.ok) {
+        throw new Error('Dashboard API endpoint failed');
       }
 
-      const propsData = await propsRes.json();
-      const arbData = await arbRes.json();
-      const discData = await discRes.json();
-      const oddsData = await oddsRes.json();
-      const valueData = await valueRes.json(); 
-      const consensusData = await consensusRes.json();
+      const dashboard = await dashboardRes.json();
 
-      setAllProps(propsData);
-      setArbitrage(arbData);
-      setDiscrepancies(discData);
-      setBestOdds(oddsData);
-      setValueBets(valueData); 
-      setConsensusBets(consensusData);
+      setAllProps(dashboard.props);
+      setArbitrage(dashboard.arbitrage);
+      setDiscrepancies(dashboard.discrepancies);
+      setBestOdds(dashboard.best_odds);
+      setValueBets(dashboard.value_bets); 
+      setConsensusBets(dashboard.consensus_bets);
 
     } catch (error) {
       console.error('Error fetching data:', error);
@@ -143,7 +132,20 @@ const NBAPropsDashboard = () => {
         throw new Error(errData.error || 'Failed to start scraper process.');
       }
 
-      // The scraper is now a blocking call, so we can fetch data immediately after.
+      // The scraper runs in the background on the API; poll until it is done.
+      let status = { running: true };
+      while (status.running) {
+        await new Promise(resolve => setTimeout(resolve, 3000));
+        const statusRes = await fetch(`${API_BASE}/scrape-status`);
+        if (!statusRes.ok) {
+          throw new Error('Failed to check scraper status.');
+        }
+        status = await statusRes.json();
+      }
+      if (status.error || status.success === false) {
+        throw new Error(status.error || 'All scrapers failed.');
+      }
+
       await fetchAllData(); 
       
     } catch (err) {
@@ -1,53 +1,83 @@
 import os
+import re
 import json
+import functools
 import sqlite3
-from datetime import datetime
+import threading
+import orjson
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.request import pathname2url
+
+_GAME_DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}\Z')
+
+# Directories this process already created; makedirs stats every path component
+_created_dirs = set()
+
+def ensure_dir(folder_path):
+    """os.makedirs(exist_ok=True), but only once per folder per process"""
+    if folder_path not in _created_dirs:
+        os.makedirs(folder_path, exist_ok=True)
+        _created_dirs.add(folder_path)
 
 def get_output_path(base_folder, sportsbook, game_date_str):
     """
     Creates a hierarchical path: base_folder/sportsbook/YYYY/MM/filename.json
     Example: props_data/draftkings/2025/10/draftkings_nba_props_2025-10-24.json
     """
-    # Parse the date
-    date_obj = datetime.strptime(game_date_str, '%Y-%m-%d')
-    year = date_obj.strftime('%Y')
-    month = date_obj.strftime('%m')
+    # Scrapers always produce YYYY-MM-DD, so slice instead of strptime/strftime
+    if not _GAME_DATE_RE.match(game_date_str):
+        raise ValueError(f"game_date '{game_date_str}' is not YYYY-MM-DD")
+    year = game_date_str[:4]
+    month = game_date_str[5:7]
     
     # Create the directory structure
     folder_path = os.path.join(base_folder, sportsbook, year, month)
-    os.makedirs(folder_path, exist_ok=True)
+    ensure_dir(folder_path)
     
     # Create the filename
     filename = f"{sportsbook}_nba_props_{game_date_str}.json"
     
     return os.path.join(folder_path, filename)
 
-def american_to_decimal(american_odds):
-    """Convert American odds to decimal odds - handles strings, unicode, None, etc."""
-    if american_odds is None:
+# Unicode minus / en dash / em dash -> ASCII hyphen, in one pass
+_DASH_MAP = str.maketrans({'\u2212': '-', '\u2013': '-', '\u2014': '-'})
+
+def clean_odds_value(odds_value):
+    """Clean and convert odds value to integer (None if it isn't one)"""
+    # Stored odds are already ints; skip the string round trip for them
+    if type(odds_value) is int:
+        return odds_value
+    if odds_value is None:
         return None
     
-    # Convert to string first to handle any type
-    odds_str = str(american_odds).strip()
-    
-    # Replace unicode minus signs with standard hyphen
-    odds_str = odds_str.replace('−', '-')  # Unicode minus
-    odds_str = odds_str.replace('–', '-')  # En dash
-    odds_str = odds_str.replace('—', '-')  # Em dash
-    odds_str = odds_str.replace('\u2212', '-')  # Another unicode minus
-    
-    # Remove any extra whitespace
-    odds_str = odds_str.strip()
+    odds_str = str(odds_value).strip().translate(_DASH_MAP)
     
-    # Try to convert to int
     try:
-        american_odds = int(odds_str)
+        return int(odds_str)
     except (ValueError, TypeError):
-        print(f"Warning: Could not convert odds '{american_odds}' to integer")
+        return None
+
+def american_to_decimal(american_odds):
+    """Convert American odds to decimal odds - handles strings, unicode, None, etc."""
+    if type(american_odds) is int:
+        return _decimal_from_american(american_odds)
+    if american_odds is None:
         return None
     
-    # Now do the conversion
+    # Strip whitespace, normalize unicode minus/dashes and parse in one go
+    odds = clean_odds_value(american_odds)
+    if odds is None:
+        print(f"Warning: Could not convert odds '{american_odds}' to integer")
+        return None
+    return _decimal_from_american(odds)
+
+# Only a few hundred distinct prices exist across a slate, and this is pure
+@functools.lru_cache(maxsize=4096)
+def _decimal_from_american(american_odds):
+    """Decimal odds for an already-parsed integer American price"""
     if american_odds > 0:
         return (american_odds / 100) + 1
     else:
@@ -73,8 +103,15 @@ def calculate_arbitrage_profit(odds1, odds2):
         return None
     
     # Calculate implied probabilities
-    prob1 = 1 / decimal1
-    prob2 = 1 / decimal2
+    return arbitrage_profit_from_probabilities(1 / decimal1, 1 / decimal2)
+
+def arbitrage_profit_from_probabilities(prob1, prob2):
+    """
+    Profit percentage for two opposite sides given their implied probabilities
+    (as fractions). Returns None if there's no arbitrage or a side is missing.
+    """
+    if prob1 is None or prob2 is None:
+        return None
     
     # Total probability (should be < 1 for arbitrage)
     total_prob = prob1 + prob2
@@ -86,6 +123,16 @@ def calculate_arbitrage_profit(odds1, odds2):
     
     return None
 
+def calculate_arbitrage_stakes(over_decimal, under_decimal, total_stake=100):
+    """
+    Split total_stake across an arbitrage so both outcomes pay the same.
+    Takes decimal odds; returns (stake_over, stake_under, guaranteed_profit).
+    """
+    stake_over = total_stake / (1 + (over_decimal / under_decimal))
+    stake_under = total_stake - stake_over
+    profit = (stake_over * over_decimal) - total_stake
+    return stake_over, stake_under, profit
+
 def calculate_ev(odds, true_probability):
     """
     Calculate expected value of a bet.
@@ -106,12 +153,16 @@ def calculate_ev(odds, true_probability):
 
 # Add these helper functions near the top with other helpers
 
-def calculate_implied_probability(american_odds):
-    """Calculate implied probability from American odds"""
+def implied_prob_from_american(american_odds):
+    """Implied probability (0-1) straight from integer American odds, no decimal detour"""
     if american_odds > 0:
-        return 100 / (american_odds + 100) * 100
+        return 100 / (american_odds + 100)
     else:
-        return abs(american_odds) / (abs(american_odds) + 100) * 100
+        return abs(american_odds) / (abs(american_odds) + 100)
+
+def calculate_implied_probability(american_odds):
+    """Calculate implied probability from American odds"""
+    return implied_prob_from_american(american_odds) * 100
 
 def calculate_vig_free_probability(over_odds, under_odds):
     """
@@ -218,50 +269,577 @@ def calculate_sharp_indicators(dk_over, dk_under, fd_over, fd_under):
     
     return indicators if indicators else None
 
+# Applied to every SQLite connection we open. WAL lets the dashboard keep
+# reading while a scrape writes; the rest trades a little durability and RAM
+# for far fewer disk reads on the repeated per-date scans.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",    # 64 MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB memory-mapped I/O
+    "PRAGMA foreign_keys=OFF",     # No foreign keys declared; skip the checks
+)
+
+# Prepared statements kept per connection. Each thread reuses its connection,
+# so the route queries stay compiled across requests instead of re-parsing.
+SQLITE_CACHED_STATEMENTS = 256
+
+def tune_connection(conn):
+    """Apply SQLITE_PRAGMAS to a freshly opened connection"""
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def rows_as_dicts(cursor, columns=None):
+    """
+    Fetch the rest of a cursor's rows as plain dicts (what the scans and
+    orjson want). Zipping against the column names once per query measured
+    faster than sqlite3.Row plus dict() per row. Pass the statement's known
+    column tuple to skip reading cursor.description.
+    """
+    if columns is None:
+        columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+@dataclass(slots=True)
+class Prop:
+    """
+    One scraped prop. Scrapers buffer thousands of these per run; slots keep
+    each one far smaller than the equivalent dict until save_props converts them.
+    """
+    player: str
+    prop_type: str
+    line: float
+    over_odds: int
+    under_odds: int
+    game: str
+    game_date: str
+    team: str = None
+    sportsbook: str = None
+
+    def as_dict(self):
+        """The dict save_props stores; team/sportsbook are left out when a book doesn't supply them"""
+        prop = {
+            'player': self.player,
+            'prop_type': self.prop_type,
+            'line': self.line,
+            'over_odds': self.over_odds,
+            'under_odds': self.under_odds,
+            'game': self.game,
+            'game_date': self.game_date,
+        }
+        if self.team is not None:
+            prop['team'] = self.team
+        if self.sportsbook is not None:
+            prop['sportsbook'] = self.sportsbook
+        return prop
+
+# --- Shared Analyses ---
+# These work on plain prop rows, so the same logic serves the per-endpoint SQL
+# queries and the dashboard snapshot (one query per date, everything else in memory).
+
+def build_prop_comparison(props):
+    """
+    Pivot one date's props into a row per (player, prop_type, line) with each
+    book's odds side by side; only lines offered by more than one book.
+    In-memory equivalent of the prop_comparison CTE used by the SQL queries.
+    """
+    grouped = {}
+    for prop in props:
+        key = (prop['player'], prop['prop_type'], prop['line'])
+        row = grouped.get(key)
+        if row is None:
+            row = grouped[key] = {
+                'player': prop['player'],
+                'prop_type': prop['prop_type'],
+                'line': prop['line'],
+                'dk_over': None,
+                'dk_under': None,
+                'fd_over': None,
+                'fd_under': None,
+                'game': None,
+                'team': None,
+                'books': set()
+            }
+        
+        book = prop['sportsbook']  # Stored lowercase
+        row['books'].add(book)
+        if book in ('draftkings', 'fanduel'):
+            prefix = 'dk' if book == 'draftkings' else 'fd'
+            for side in ('over', 'under'):
+                odds = prop[f'{side}_odds']
+                current = row[f'{prefix}_{side}']
+                if odds is not None and (current is None or odds > current):
+                    row[f'{prefix}_{side}'] = odds
+        
+        # MAX(game) / MAX(team), ignoring NULLs like SQL does
+        for field in ('game', 'team'):
+            value = prop.get(field)
+            if value is not None and (row[field] is None or value > row[field]):
+                row[field] = value
+    
+    comparison = []
+    for key in sorted(grouped):
+        row = grouped[key]
+        if len(row.pop('books')) > 1:
+            comparison.append(row)
+    return comparison
+
+def scan_line_discrepancies(props, min_line_diff=1.0):
+    """Pair every DraftKings line with the FanDuel lines for the same player/prop"""
+    fd_by_key = defaultdict(list)
+    for prop in props:
+        if prop['sportsbook'] == 'fanduel':
+            fd_by_key[(prop['player'], prop['prop_type'])].append(prop)
+    
+    discrepancies = []
+    for dk in props:
+        if dk['sportsbook'] != 'draftkings':
+            continue
+        for fd in fd_by_key.get((dk['player'], dk['prop_type']), ()):
+            line_difference = abs(dk['line'] - fd['line'])
+            if line_difference >= min_line_diff:
+                discrepancies.append({
+                    'player': dk['player'],
+                    'prop_type': dk['prop_type'],
+                    'dk_line': dk['line'],
+                    'dk_over': dk['over_odds'],
+                    'dk_under': dk['under_odds'],
+                    'fd_line': fd['line'],
+                    'fd_over': fd['over_odds'],
+                    'fd_under': fd['under_odds'],
+                    'game': dk['game'],
+                    'team': dk['team'],
+                    'line_difference': line_difference
+                })
+    
+    return sorted(discrepancies, key=lambda x: x['line_difference'], reverse=True)
+
+def scan_arbitrage(props, min_profit_percent=0.5):
+    """Arbitrage opportunities from prop comparison rows"""
+    arbitrage_opportunities = []
+    
+    # The same prices repeat across the whole slate (-110 on hundreds of lines),
+    # so parse each distinct odds value into decimal odds once and let the
+    # per-row work be plain float arithmetic
+    decimals = {}
+    probabilities = {}
+    for prop in props:
+        for field in ('dk_over', 'dk_under', 'fd_over', 'fd_under'):
+            odds = prop[field]
+            if odds and odds not in decimals:
+                decimal = american_to_decimal(odds)
+                decimals[odds] = decimal
+                # Unparseable odds can never be part of an arbitrage
+                if decimal is None:
+                    probabilities[odds] = 2.0
+                else:
+                    probabilities[odds] = implied_prob_from_american(clean_odds_value(odds))
+    
+    def check(over_odds, under_odds):
+        """(profit_percent, stakes per $100) for one over/under pairing, or None"""
+        # Nearly every pairing carries vig (implied total >= 1); reject those
+        # with one float add before doing any real work. The closed-form
+        # probabilities can differ from 1/decimal in the last bit, but only
+        # for totals within rounding of 1, which never round to a profit.
+        if probabilities[over_odds] + probabilities[under_odds] >= 1:
+            return None
+        over_decimal = decimals[over_odds]
+        under_decimal = decimals[under_odds]
+        profit = arbitrage_profit_from_probabilities(1 / over_decimal, 1 / under_decimal)
+        if not profit or profit < min_profit_percent:
+            return None
+        return profit, calculate_arbitrage_stakes(over_decimal, under_decimal)
+    
+    for prop in props:
+        # Check DK Over vs FD Under
+        if prop['dk_over'] and prop['fd_under']:
+            hit = check(prop['dk_over'], prop['fd_under'])
+            if hit:
+                profit, (stake_over, stake_under, stake_profit) = hit
+                arbitrage_opportunities.append({
+                    'player': prop['player'],
+                    'prop_type': prop['prop_type'],
+                    'line': prop['line'],
+                    'game': prop['game'],
+                    'team': prop['team'],
+                    'bet_over': 'DraftKings',
+                    'over_odds': prop['dk_over'],
+                    'bet_under': 'FanDuel',
+                    'under_odds': prop['fd_under'],
+                    'profit_percent': profit,
+                    'stake_over': stake_over,
+                    'stake_under': stake_under,
+                    'stake_profit': stake_profit,
+                    'type': 'arbitrage'
+                })
+        
+        # Check FD Over vs DK Under
+        if prop['fd_over'] and prop['dk_under']:
+            hit = check(prop['fd_over'], prop['dk_under'])
+            if hit:
+                profit, (stake_over, stake_under, stake_profit) = hit
+                arbitrage_opportunities.append({
+                    'player': prop['player'],
+                    'prop_type': prop['prop_type'],
+                    'line': prop['line'],
+                    'game': prop['game'],
+                    'team': prop['team'],
+                    'bet_over': 'FanDuel',
+                    'over_odds': prop['fd_over'],
+                    'bet_under': 'DraftKings',
+                    'under_odds': prop['dk_under'],
+                    'profit_percent': profit,
+                    'stake_over': stake_over,
+                    'stake_under': stake_under,
+                    'stake_profit': stake_profit,
+                    'type': 'arbitrage'
+                })
+    
+    return sorted(arbitrage_opportunities, key=lambda x: x['profit_percent'], reverse=True)
+
+def scan_best_odds(props, min_odds_diff=10):
+    """Same line, meaningfully better odds at one book"""
+    best_odds = []
+    
+    for prop in props:
+        # Compare over odds
+        if prop['dk_over'] and prop['fd_over']:
+            over_diff = abs(prop['dk_over'] - prop['fd_over'])
+            if over_diff >= min_odds_diff:
+                best_book = 'DraftKings' if prop['dk_over'] > prop['fd_over'] else 'FanDuel'
+                best_odds_value = max(prop['dk_over'], prop['fd_over'])
+                worst_odds_value = min(prop['dk_over'], prop['fd_over'])
+                
+                best_odds.append({
+                    'player': prop['player'],
+                    'prop_type': prop['prop_type'],
+                    'line': prop['line'],
+                    'game': prop['game'],
+                    'team': prop['team'],
+                    'side': 'Over',
+                    'best_book': best_book,
+                    'best_odds': best_odds_value,
+                    'other_odds': worst_odds_value,
+                    'odds_difference': over_diff,
+                    'dk_odds': prop['dk_over'],
+                    'fd_odds': prop['fd_over']
+                })
+        
+        # Compare under odds
+        if prop['dk_under'] and prop['fd_under']:
+            under_diff = abs(prop['dk_under'] - prop['fd_under'])
+            if under_diff >= min_odds_diff:
+                best_book = 'DraftKings' if prop['dk_under'] > prop['fd_under'] else 'FanDuel'
+                best_odds_value = max(prop['dk_under'], prop['fd_under'])
+                worst_odds_value = min(prop['dk_under'], prop['fd_under'])
+                
+                best_odds.append({
+                    'player': prop['player'],
+                    'prop_type': prop['prop_type'],
+                    'line': prop['line'],
+                    'game': prop['game'],
+                    'team': prop['team'],
+                    'side': 'Under',
+                    'best_book': best_book,
+                    'best_odds': best_odds_value,
+                    'other_odds': worst_odds_value,
+                    'odds_difference': under_diff,
+                    'dk_odds': prop['dk_under'],
+                    'fd_odds': prop['fd_under']
+                })
+    
+    return sorted(best_odds, key=lambda x: x['odds_difference'], reverse=True)
+
+def scan_value_bets(props, min_edge=2.0, min_odds_diff=20):
+    """Value bets from prop comparison rows (largest odds disagreement first)"""
+    value_bets = []
+    
+    for prop in props:
+        # Use the best odds from each book
+        best_over_odds = max([o for o in [prop['dk_over'], prop['fd_over']] if o]) if prop['dk_over'] or prop['fd_over'] else None
+        best_under_odds = max([o for o in [prop['dk_under'], prop['fd_under']] if o]) if prop['dk_under'] or prop['fd_under'] else None
+        
+        if not best_over_odds or not best_under_odds:
+            continue
+        
+        # Check for value on the over
+        value = find_value_bets(best_over_odds, best_under_odds, threshold=min_edge)
+        
+        # Check for sharp indicators
+        sharp = calculate_sharp_indicators(
+            prop['dk_over'], prop['dk_under'],
+            prop['fd_over'], prop['fd_under']
+        )
+        
+        # --- MODIFIED LOGIC ---
+        # Determine which side has the bigger discrepancy
+        over_diff = abs(prop['dk_over'] - prop['fd_over']) if prop['dk_over'] and prop['fd_over'] else 0
+        under_diff = abs(prop['dk_under'] - prop['fd_under']) if prop['dk_under'] and prop['fd_under'] else 0
+
+        # Only proceed if there's a significant odds difference
+        if over_diff < min_odds_diff and under_diff < min_odds_diff:
+            continue
+        
+        if over_diff > under_diff:
+            # Value is on the OVER
+            recommended_side = 'over'
+            best_book = 'DraftKings' if prop['dk_over'] > prop['fd_over'] else 'FanDuel'
+            best_odds = max(prop['dk_over'], prop['fd_over'])
+            edge_percent = over_diff / 10  # Simple edge calc based on diff
+            reasoning = "Odds discrepancy"
+        else:
+            # Value is on the UNDER
+            recommended_side = 'under'
+            best_book = 'DraftKings' if prop['dk_under'] > prop['fd_under'] else 'FanDuel'
+            best_odds = max(prop['dk_under'], prop['fd_under'])
+            edge_percent = under_diff / 10 # Simple edge calc based on diff
+            reasoning = "Odds discrepancy"
+
+        value_bet = {
+            'player': prop['player'],
+            'prop_type': prop['prop_type'],
+            'line': prop['line'],
+            'game': prop['game'],
+            'team': prop['team'],
+            'recommended_side': recommended_side,
+            'best_book': best_book,
+            'best_odds': best_odds,
+            'edge_percent': edge_percent,
+            'confidence': 'medium' if edge_percent > 15 else 'low',
+            'reasoning': reasoning,
+            'sharp_indicators': sharp,
+            'all_odds': {
+                'dk_over': prop['dk_over'],
+                'dk_under': prop['dk_under'],
+                'fd_over': prop['fd_over'],
+                'fd_under': prop['fd_under']
+            }
+        }
+        
+        value_bets.append(value_bet)
+    
+    # Sort by edge percentage (highest edge first)
+    return sorted(value_bets, key=lambda x: x['edge_percent'], reverse=True)
+
+def scan_consensus_bets(props, min_odds_diff=20):
+    """Both books favor the same side, but one is significantly cheaper"""
+    consensus_bets = []
+    
+    for prop in props:
+        # Consensus needs both sides priced at both books
+        if None in (prop['dk_over'], prop['dk_under'], prop['fd_over'], prop['fd_under']):
+            continue
+        
+        # Check OVER consensus
+        if prop['dk_over'] < 0 and prop['fd_over'] < 0:
+            over_diff = abs(prop['dk_over'] - prop['fd_over'])
+            if over_diff >= min_odds_diff:
+                # Find the better (less negative) odds
+                best_book = 'DraftKings' if prop['dk_over'] > prop['fd_over'] else 'FanDuel'
+                best_odds = max(prop['dk_over'], prop['fd_over'])
+                worst_odds = min(prop['dk_over'], prop['fd_over'])
+                
+                consensus_bets.append({
+                    'player': prop['player'],
+                    'prop_type': prop['prop_type'],
+                    'line': prop['line'],
+                    'game': prop['game'],
+                    'team': prop['team'],
+                    'side': 'Over',
+                    'best_book': best_book,
+                    'best_odds': best_odds,
+                    'other_odds': worst_odds,
+                    'odds_difference': over_diff,
+                    'reasoning': f"Market consensus favors Over. Get {over_diff} point discount."
+                })
+
+        # Check UNDER consensus
+        if prop['dk_under'] < 0 and prop['fd_under'] < 0:
+            under_diff = abs(prop['dk_under'] - prop['fd_under'])
+            if under_diff >= min_odds_diff:
+                # Find the better (less negative) odds
+                best_book = 'DraftKings' if prop['dk_under'] > prop['fd_under'] else 'FanDuel'
+                best_odds = max(prop['dk_under'], prop['fd_under'])
+                worst_odds = min(prop['dk_under'], prop['fd_under'])
+                
+                consensus_bets.append({
+                    'player': prop['player'],
+                    'prop_type': prop['prop_type'],
+                    'line': prop['line'],
+                    'game': prop['game'],
+                    'team': prop['team'],
+                    'side': 'Under',
+                    'best_book': best_book,
+                    'best_odds': best_odds,
+                    'other_odds': worst_odds,
+                    'odds_difference': under_diff,
+                    'reasoning': f"Market consensus favors Under. Get {under_diff} point discount."
+                })
+
+    return sorted(consensus_bets, key=lambda x: x['odds_difference'], reverse=True)
+
 class PropsDatabase:
-    def __init__(self, db_path="props_data/props.db"):
+    def __init__(self, db_path="props_data/props.db", read_only=False):
         # Ensure directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        ensure_dir(os.path.dirname(db_path))
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        # One connection per thread, so a single instance can be shared by
+        # the API's request threads without reopening the file every call
+        self._local = threading.local()
+        self._pivot_cache = {}
+        # data_version numbers only compare within one connection, so the
+        # snapshot cache reads them from a single connection every thread shares
+        self._version_conn = None
+        self._version_lock = threading.Lock()
+        self.read_only = False
         self.create_tables()
+        
+        # Schema is in place; from here on a read-only instance opens its
+        # connections with mode=ro, starting with this thread's
+        self.read_only = read_only
+        if read_only:
+            self._local.conn.close()
+            self._local.conn = None
+    
+    @property
+    def conn(self):
+        """SQLite connection for the calling thread, opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+    
+    def _connect(self):
+        if self.read_only:
+            # Opened read-only at the file level: under WAL these readers
+            # never contend with a scrape writing through another connection
+            target, uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro", True
+        else:
+            target, uri = self.db_path, False
+        # isolation_level=None: no implicit BEGINs, writers open their own transactions
+        return tune_connection(sqlite3.connect(target, uri=uri, check_same_thread=False,
+                                               isolation_level=None,
+                                               cached_statements=SQLITE_CACHED_STATEMENTS))
+    
+    # Clustered on the natural key: rows for one player sit together on
+    # disk and lookups by key need no separate rowid -> row step
+    PROPS_TABLE_SQL = '''
+        CREATE TABLE IF NOT EXISTS player_props (
+            player TEXT NOT NULL,
+            team TEXT,
+            prop_type TEXT NOT NULL,
+            line REAL NOT NULL,
+            over_odds INTEGER,
+            under_odds INTEGER,
+            sportsbook TEXT NOT NULL,
+            game_date TEXT NOT NULL,
+            game TEXT,
+            scrape_timestamp TEXT NOT NULL,
+            PRIMARY KEY (player, prop_type, line, sportsbook, game_date)
+        ) WITHOUT ROWID
+    '''
+    
+    # Stored in PRAGMA user_version once _migrate has run, so opening an
+    # up-to-date database (every API start, every scrape) skips it
+    SCHEMA_VERSION = 1
     
     def create_tables(self):
         """Create the props table if it doesn't exist"""
         cursor = self.conn.cursor()
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] < self.SCHEMA_VERSION:
+            self._migrate(cursor)
+        
+        cursor.execute("BEGIN")
+        cursor.execute(self.PROPS_TABLE_SQL)
+        # Create indexes for faster queries
+        self._create_indexes(cursor)
+        # Analytics payloads materialized at scrape time, one row per
+        # (date, endpoint), so the API can serve them with a keyed lookup
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS player_props (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player TEXT NOT NULL,
-                team TEXT,
-                prop_type TEXT NOT NULL,
-                line REAL NOT NULL,
-                over_odds INTEGER,
-                under_odds INTEGER,
-                sportsbook TEXT NOT NULL,
+            CREATE TABLE IF NOT EXISTS dashboard_cache (
                 game_date TEXT NOT NULL,
-                game TEXT,
-                scrape_timestamp TEXT NOT NULL,
-                UNIQUE(player, prop_type, line, sportsbook, game_date)
+                endpoint TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                generated_at TEXT NOT NULL,
+                PRIMARY KEY (game_date, endpoint)
             )
         ''')
         
-        # Create indexes for faster queries
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_player_date 
-            ON player_props(player, game_date)
-        ''')
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_date_sportsbook 
-            ON player_props(game_date, sportsbook)
-        ''')
+        self.conn.commit()
+    
+    def _migrate(self, cursor):
+        """One-time upgrades for databases older than SCHEMA_VERSION"""
+        # Several processes may open an old database at once; the write lock
+        # lets the first migrate while the rest wait and then see the new version
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= self.SCHEMA_VERSION:
+            self.conn.commit()
+            return
+        
+        # Tables from before the WITHOUT ROWID layout carry a surrogate id;
+        # move them aside so their rows can be copied into the new layout
+        cursor.execute("PRAGMA table_info(player_props)")
+        legacy = 'id' in [column[1] for column in cursor.fetchall()]
+        if legacy:
+            cursor.execute("ALTER TABLE player_props RENAME TO player_props_legacy")
+        cursor.execute(self.PROPS_TABLE_SQL)
+        if legacy:
+            columns = ', '.join(self.PROPS_COLUMNS)
+            cursor.execute(f"INSERT INTO player_props ({columns}) SELECT {columns} FROM player_props_legacy")
+            # Drops the legacy indexes with it; create_tables rebuilds them
+            cursor.execute("DROP TABLE player_props_legacy")
+            print("  Migrated player_props to the WITHOUT ROWID layout")
+        
+        # Sportsbook is stored lowercase so queries can compare it directly
+        # (and seek idx_date_sportsbook) instead of calling LOWER() per row.
+        # Normalizes rows written before that.
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_prop_type 
-            ON player_props(prop_type)
+            UPDATE OR REPLACE player_props SET sportsbook = LOWER(sportsbook)
+            WHERE sportsbook <> LOWER(sportsbook)
         ''')
+        # Nothing filters on prop_type alone; player lookups use idx_player_date
+        # or the primary key, so this one only cost writes
+        cursor.execute("DROP INDEX IF EXISTS idx_prop_type")
         
+        cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
         self.conn.commit()
     
+    # Secondary indexes on player_props (the primary key is the table itself
+    # and always kept). Covering idx_props_date_key holds every column
+    # the per-date analytics read, keyed in the order they group by
+    # (game_date, player, prop_type, line, ...), so they never touch the table.
+    INDEXES = (
+        ('idx_player_date', 'player_props(player, game_date)'),
+        ('idx_date_sportsbook', 'player_props(game_date, sportsbook)'),
+        ('idx_props_date_key', '''player_props(game_date, player, prop_type, line, sportsbook,
+                            over_odds, under_odds, game, team)'''),
+    )
+    
+    # Batches this big skip index maintenance and rebuild afterwards, but only
+    # when they outnumber the rows already stored. Otherwise the rebuild would
+    # cost more than the per-row updates it saves.
+    BULK_INSERT_MIN_ROWS = 500
+    
+    def _create_indexes(self, cursor):
+        for name, target in self.INDEXES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    
+    def _drop_indexes(self, cursor):
+        for name, _ in self.INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    
+    # We no longer need ON CONFLICT because insert_props deletes the old data first
+    INSERT_PROP_SQL = '''
+        INSERT INTO player_props 
+        (player, team, prop_type, line, over_odds, under_odds, 
+        sportsbook, game_date, game, scrape_timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
     def insert_props(self, props_list, sportsbook):
         """
         Delete all props for the given sportsbook and game_dates, 
@@ -273,63 +851,60 @@ class PropsDatabase:
             
         cursor = self.conn.cursor()
         scrape_time = datetime.now().isoformat()
+        sportsbook = sportsbook.lower()
         
-        # --- NEW: Clear stale data first ---
-        # Get all unique game dates from the props list
-        game_dates_in_batch = set(p.get('game_date') for p in props_list if p.get('game_date'))
-        
-        deleted = 0
-        if game_dates_in_batch:
-            print(f"  Clearing stale props for {sportsbook} on dates: {', '.join(game_dates_in_batch)}...")
-            try:
-                # Use a tuple for the IN clause
-                placeholders = ','.join('?' for _ in game_dates_in_batch)
-                query = f"DELETE FROM player_props WHERE sportsbook = ? AND game_date IN ({placeholders})"
-                
-                # Prepare arguments
-                args = [sportsbook] + list(game_dates_in_batch)
-                
-                cursor.execute(query, args)
-                deleted = cursor.rowcount
-            except sqlite3.Error as e:
-                print(f"  Error deleting props: {e}")
+        # The connection runs in autocommit mode, so open the write transaction
+        # ourselves; the DELETE and INSERTs below commit (or roll back) together
+        cursor.execute("BEGIN IMMEDIATE")
+        with self.conn:
+            # --- NEW: Clear stale data first ---
+            # Get all unique game dates from the props list
+            game_dates_in_batch = set(p.get('game_date') for p in props_list if p.get('game_date'))
+            
+            deleted = 0
+            if game_dates_in_batch:
+                print(f"  Clearing stale props for {sportsbook} on dates: {', '.join(game_dates_in_batch)}...")
+                try:
+                    # Use a tuple for the IN clause
+                    placeholders = ','.join('?' for _ in game_dates_in_batch)
+                    query = f"DELETE FROM player_props WHERE sportsbook = ? AND game_date IN ({placeholders})"
+                    
+                    # Prepare arguments
+                    args = [sportsbook] + list(game_dates_in_batch)
+                    
+                    cursor.execute(query, args)
+                    deleted = cursor.rowcount
+                except sqlite3.Error as e:
+                    print(f"  Error deleting props: {e}")
+                    
+                if deleted > 0:
+                    print(f"  ...removed {deleted} stale props.")
                 
-            if deleted > 0:
-                print(f"  ...removed {deleted} stale props.")
-        # --- END NEW ---
+                # Precomputed analytics for these dates are now out of date
+                cursor.execute(f"DELETE FROM dashboard_cache WHERE game_date IN ({placeholders})",
+                               list(game_dates_in_batch))
+            # --- END NEW ---
 
-        inserted = 0
-        for prop in props_list:
-            try:
+            rows = []
+            for prop in props_list:
                 # Clean odds values before inserting
                 over_odds = prop.get('over_odds')
                 under_odds = prop.get('under_odds')
                 
                 # Convert odds to integers if they're strings
                 if over_odds is not None:
-                    over_odds_str = str(over_odds).replace('−', '-').replace('–', '-').replace('—', '-').strip()
-                    try:
-                        over_odds = int(over_odds_str)
-                    except (ValueError, TypeError):
-                        print(f"Warning: Invalid over_odds '{over_odds}' for {prop.get('player')} - skipping")
+                    over_odds = clean_odds_value(over_odds)
+                    if over_odds is None:
+                        print(f"Warning: Invalid over_odds '{prop.get('over_odds')}' for {prop.get('player')} - skipping")
                         continue
                 
                 if under_odds is not None:
-                    under_odds_str = str(under_odds).replace('−', '-').replace('–', '-').replace('—', '-').strip()
-                    try:
-                        under_odds = int(under_odds_str)
-                    except (ValueError, TypeError):
-                        print(f"Warning: Invalid under_odds '{under_odds}' for {prop.get('player')} - skipping")
+                    under_odds = clean_odds_value(under_odds)
+                    if under_odds is None:
+                        print(f"Warning: Invalid under_odds '{prop.get('under_odds')}' for {prop.get('player')} - skipping")
                         continue
-
-                # --- MODIFIED: Use a simple INSERT ---
-                # We no longer need ON CONFLICT because we deleted all old data
-                cursor.execute('''
-                    INSERT INTO player_props 
-                    (player, team, prop_type, line, over_odds, under_odds, 
-                    sportsbook, game_date, game, scrape_timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                
+                rows.append((
                     prop.get('player'),
                     prop.get('team'),
                     prop.get('prop_type'),
@@ -341,183 +916,218 @@ class PropsDatabase:
                     prop.get('game'),
                     scrape_time
                 ))
-                
-                inserted += 1
-                    
-            except sqlite3.Error as e:
-                # Handle UNIQUE constraint error just in case, e.g., duplicate in scrape
-                if "UNIQUE constraint" in str(e):
-                    print(f"  Warning: Duplicate prop found in scrape batch for {prop.get('player')}. Skipping.")
-                else:
-                    print(f"  Error inserting prop: {e}")
-                continue
-        
-        self.conn.commit()
+            
+            # One executemany for the whole batch, in the same transaction as the
+            # DELETE above. A bad row (e.g. a duplicate in the scrape) aborts it,
+            # so roll back to the savepoint and insert row by row to skip just those.
+            rebuild_indexes = False
+            if len(rows) > self.BULK_INSERT_MIN_ROWS:
+                cursor.execute("SELECT COUNT(*) FROM player_props")
+                rebuild_indexes = len(rows) > cursor.fetchone()[0]
+            if rebuild_indexes:
+                self._drop_indexes(cursor)
+            
+            cursor.execute("SAVEPOINT insert_batch")
+            try:
+                cursor.executemany(self.INSERT_PROP_SQL, rows)
+                inserted = len(rows)
+            except sqlite3.Error:
+                cursor.execute("ROLLBACK TO insert_batch")
+                inserted = 0
+                for row in rows:
+                    try:
+                        cursor.execute(self.INSERT_PROP_SQL, row)
+                        inserted += 1
+                    except sqlite3.Error as e:
+                        # Handle UNIQUE constraint error just in case, e.g., duplicate in scrape
+                        if "UNIQUE constraint" in str(e):
+                            print(f"  Warning: Duplicate prop found in scrape batch for {row[0]}. Skipping.")
+                        else:
+                            print(f"  Error inserting prop: {e}")
+            cursor.execute("RELEASE insert_batch")
+            
+            # Rebuilt before COMMIT, so readers never see the table without them
+            if rebuild_indexes:
+                self._create_indexes(cursor)
+                # The batch outnumbered the rows already stored, so the old
+                # planner stats no longer describe the table. Ordinary batches
+                # leave that to PRAGMA optimize in close()
+                cursor.execute("ANALYZE player_props")
+        # Committed: drop the in-memory snapshots of the dates just rewritten
+        for game_date in game_dates_in_batch:
+            self._pivot_cache.pop(game_date, None)
         # --- MODIFIED: Updated print message ---
         print(f"  📊 Database: Inserted {inserted} new props for {sportsbook}.")
         return inserted, 0  # Return (inserted, updated) - updated is now 0
     
+    # Column tuples for the fixed SELECTs below, so rows can be zipped into
+    # dicts without rebuilding the name list from cursor.description each call
+    PROPS_COLUMNS = ('player', 'team', 'prop_type', 'line', 'over_odds', 'under_odds',
+                     'sportsbook', 'game_date', 'game', 'scrape_timestamp')
+    
+    PROPS_FOR_DATE_SQL = f'''
+        SELECT {', '.join(PROPS_COLUMNS)} FROM player_props 
+        WHERE game_date = ?
+        ORDER BY player, prop_type, sportsbook
+    '''
+    
+    PROPS_FOR_DATE_AND_BOOK_SQL = f'''
+        SELECT {', '.join(PROPS_COLUMNS)} FROM player_props 
+        WHERE game_date = ? AND sportsbook = ?
+        ORDER BY player, prop_type
+    '''
+    
+    PLAYER_HISTORY_SQL = f'''
+        SELECT {', '.join(PROPS_COLUMNS)} FROM player_props 
+        WHERE player = ? AND prop_type = ?
+        AND game_date >= date('now', '-' || ? || ' days')
+        ORDER BY game_date DESC, sportsbook
+    '''
+    
     def get_props_for_date(self, game_date, sportsbook=None):
         """Retrieve all props for a specific date"""
         cursor = self.conn.cursor()
         
         if sportsbook:
-            cursor.execute('''
-                SELECT * FROM player_props 
-                WHERE game_date = ? AND sportsbook = ?
-                ORDER BY player, prop_type
-            ''', (game_date, sportsbook))
+            cursor.execute(self.PROPS_FOR_DATE_AND_BOOK_SQL, (game_date, sportsbook))
         else:
-            cursor.execute('''
-                SELECT * FROM player_props 
-                WHERE game_date = ?
-                ORDER BY player, prop_type, sportsbook
-            ''', (game_date,))
+            cursor.execute(self.PROPS_FOR_DATE_SQL, (game_date,))
         
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
-        
-        return [dict(zip(columns, row)) for row in results]
+        return rows_as_dicts(cursor, self.PROPS_COLUMNS)
+    
+    PROP_COUNTS_SQL = '''
+        SELECT sportsbook, COUNT(*) FROM player_props
+        WHERE game_date = ?
+        GROUP BY sportsbook
+    '''
+    
+    def get_prop_counts(self, game_date):
+        """Props stored for a date per sportsbook, counted in one indexed query"""
+        cursor = self.conn.cursor()
+        cursor.execute(self.PROP_COUNTS_SQL, (game_date,))
+        return dict(cursor.fetchall())
     
     def get_player_history(self, player_name, prop_type, days=30):
         """Get historical props for a specific player"""
         cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT * FROM player_props 
-            WHERE player = ? AND prop_type = ?
-            AND game_date >= date('now', '-' || ? || ' days')
-            ORDER BY game_date DESC, sportsbook
-        ''', (player_name, prop_type, days))
-        
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
+        cursor.execute(self.PLAYER_HISTORY_SQL, (player_name, prop_type, days))
         
-        return [dict(zip(columns, row)) for row in results]
+        return rows_as_dicts(cursor, self.PROPS_COLUMNS)
+    
+    COMPARE_BOOKS_COLUMNS = ('player', 'prop_type', 'line', 'dk_over', 'dk_under', 'fd_over', 'fd_under')
     
     def compare_books_for_date(self, game_date):
         """Compare lines across sportsbooks for a given date"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                player,
-                prop_type,
-                line,
-                MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN over_odds END) as dk_over,
-                MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN under_odds END) as dk_under,
-                MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN over_odds END) as fd_over,
-                MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN under_odds END) as fd_under
-            FROM player_props
-            WHERE game_date = ?
-            GROUP BY player, prop_type, line
-            HAVING COUNT(DISTINCT sportsbook) > 1
-            ORDER BY player, prop_type
-        ''', (game_date,))
-        
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
-        
-        return [dict(zip(columns, row)) for row in results]
+        _, comparison = self.get_date_snapshot(game_date)
+        return [{column: row[column] for column in self.COMPARE_BOOKS_COLUMNS} for row in comparison]
     
     # Add these methods to the PropsDatabase class
 
+    COMPARISON_COLUMNS = ('player', 'prop_type', 'line', 'over_odds', 'under_odds',
+                          'sportsbook', 'game', 'team')
+    
+    ALL_PROPS_FOR_COMPARISON_SQL = f'''
+        SELECT {', '.join(COMPARISON_COLUMNS)}
+        FROM player_props
+        WHERE game_date = ?
+        ORDER BY player, prop_type, sportsbook, line
+    '''
+
     def get_all_props_for_comparison(self, game_date):
         """Get all props for a date, grouped by player and prop_type for comparison"""
         cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                player,
-                prop_type,
-                line,
-                over_odds,
-                under_odds,
-                sportsbook,
-                game,
-                team
-            FROM player_props
-            WHERE game_date = ?
-            ORDER BY player, prop_type, sportsbook, line
-        ''', (game_date,))
+        cursor.execute(self.ALL_PROPS_FOR_COMPARISON_SQL, (game_date,))
         
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
+        return rows_as_dicts(cursor, self.COMPARISON_COLUMNS)
+    
+    def iter_all_props_for_comparison(self, game_date, batch_size=1000):
+        """Same rows as get_all_props_for_comparison, pulled from SQLite batch_size at a time"""
+        cursor = self.conn.cursor()
+        cursor.execute(self.ALL_PROPS_FOR_COMPARISON_SQL, (game_date,))
         
-        return [dict(zip(columns, row)) for row in results]
+        columns = self.COMPARISON_COLUMNS
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    # Snapshots kept in memory; the UI only ever looks at a handful of dates
+    PIVOT_CACHE_MAX_DATES = 16
+    
+    def get_date_snapshot(self, game_date):
+        """
+        (props, comparison) for a date: get_all_props_for_comparison's rows and
+        their build_prop_comparison pivot. Cached until the data changes, so
+        every analysis of a date shares one query and one pivot. Callers must
+        treat both lists as read-only.
+        """
+        # Read before the query: a commit landing during it leaves the stored
+        # version behind the current one, so the snapshot is rebuilt next call
+        version = self._data_version()
+        snapshot = self._pivot_cache.get(game_date)
+        if snapshot is None or snapshot[0] != version:
+            props = self.get_all_props_for_comparison(game_date)
+            snapshot = (version, props, build_prop_comparison(props))
+            if len(self._pivot_cache) >= self.PIVOT_CACHE_MAX_DATES:
+                self._pivot_cache.clear()
+            self._pivot_cache[game_date] = snapshot
+        return snapshot[1], snapshot[2]
+    
+    def _data_version(self):
+        """
+        PRAGMA data_version of the shared version connection. It changes
+        whenever any other connection commits (the scraper, another process,
+        this instance's own per-thread connections), so a snapshot stored
+        under an older number is stale.
+        """
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = self._connect()
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
 
     def find_arbitrage_opportunities(self, game_date, min_profit_percent=0.5):
         """
         Find arbitrage opportunities where betting both sides guarantees profit.
         Returns opportunities with expected profit percentage.
         """
-        cursor = self.conn.cursor()
-        
-        # Get all props with their odds from both books
-        cursor.execute('''
-            WITH prop_comparison AS (
-                SELECT 
-                    player,
-                    prop_type,
-                    line,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN over_odds END) as dk_over,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN under_odds END) as dk_under,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN over_odds END) as fd_over,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN under_odds END) as fd_under,
-                    MAX(game) as game,
-                    MAX(team) as team
-                FROM player_props
-                WHERE game_date = ?
-                GROUP BY player, prop_type, line
-                HAVING COUNT(DISTINCT sportsbook) > 1
-            )
-            SELECT *
-            FROM prop_comparison
-            WHERE (dk_over IS NOT NULL AND fd_under IS NOT NULL)
-            OR (fd_over IS NOT NULL AND dk_under IS NOT NULL)
-        ''', (game_date,))
-        
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
-        props = [dict(zip(columns, row)) for row in results]
-        
-        arbitrage_opportunities = []
-        
-        for prop in props:
-            # Check DK Over vs FD Under
-            if prop['dk_over'] and prop['fd_under']:
-                profit = calculate_arbitrage_profit(prop['dk_over'], prop['fd_under'])
-                if profit and profit >= min_profit_percent:
-                    arbitrage_opportunities.append({
-                        'player': prop['player'],
-                        'prop_type': prop['prop_type'],
-                        'line': prop['line'],
-                        'game': prop['game'],
-                        'team': prop['team'],
-                        'bet_over': 'DraftKings',
-                        'over_odds': prop['dk_over'],
-                        'bet_under': 'FanDuel',
-                        'under_odds': prop['fd_under'],
-                        'profit_percent': profit,
-                        'type': 'arbitrage'
-                    })
-            
-            # Check FD Over vs DK Under
-            if prop['fd_over'] and prop['dk_under']:
-                profit = calculate_arbitrage_profit(prop['fd_over'], prop['dk_under'])
-                if profit and profit >= min_profit_percent:
-                    arbitrage_opportunities.append({
-                        'player': prop['player'],
-                        'prop_type': prop['prop_type'],
-                        'line': prop['line'],
-                        'game': prop['game'],
-                        'team': prop['team'],
-                        'bet_over': 'FanDuel',
-                        'over_odds': prop['fd_over'],
-                        'bet_under': 'DraftKings',
-                        'under_odds': prop['dk_under'],
-                        'profit_percent': profit,
-                        'type': 'arbitrage'
-                    })
-        
-        return sorted(arbitrage_opportunities, key=lambda x: x['profit_percent'], reverse=True)
+        _, comparison = self.get_date_snapshot(game_date)
+        return scan_arbitrage(comparison, min_profit_percent)
+
+    # Route queries live in constants so each call passes SQLite the exact same
+    # text and reuses the prepared statement from the connection's cache
+    FIND_LINE_DISCREPANCIES_SQL = '''
+        WITH dk_props AS (
+            SELECT player, prop_type, line, over_odds, under_odds, game, team
+            FROM player_props
+            WHERE game_date = ? AND sportsbook = 'draftkings'
+        ),
+        fd_props AS (
+            SELECT player, prop_type, line, over_odds, under_odds, game, team
+            FROM player_props
+            WHERE game_date = ? AND sportsbook = 'fanduel'
+        )
+        SELECT 
+            dk.player,
+            dk.prop_type,
+            dk.line as dk_line,
+            dk.over_odds as dk_over,
+            dk.under_odds as dk_under,
+            fd.line as fd_line,
+            fd.over_odds as fd_over,
+            fd.under_odds as fd_under,
+            dk.game,
+            dk.team,
+            ABS(dk.line - fd.line) as line_difference
+        FROM dk_props dk
+        JOIN fd_props fd ON dk.player = fd.player AND dk.prop_type = fd.prop_type
+        WHERE ABS(dk.line - fd.line) >= ?
+        ORDER BY line_difference DESC
+    '''
+
+    LINE_DISCREPANCY_COLUMNS = ('player', 'prop_type', 'dk_line', 'dk_over', 'dk_under', 'fd_line',
+                                'fd_over', 'fd_under', 'game', 'team', 'line_difference')
 
     def find_line_discrepancies(self, game_date, min_line_diff=1.0):
         """
@@ -527,124 +1137,17 @@ class PropsDatabase:
         cursor = self.conn.cursor()
         
         # Get all unique player/prop combinations that exist on both books
-        cursor.execute('''
-            WITH dk_props AS (
-                SELECT player, prop_type, line, over_odds, under_odds, game, team
-                FROM player_props
-                WHERE game_date = ? AND LOWER(sportsbook) = 'draftkings'
-            ),
-            fd_props AS (
-                SELECT player, prop_type, line, over_odds, under_odds, game, team
-                FROM player_props
-                WHERE game_date = ? AND LOWER(sportsbook) = 'fanduel'
-            )
-            SELECT 
-                dk.player,
-                dk.prop_type,
-                dk.line as dk_line,
-                dk.over_odds as dk_over,
-                dk.under_odds as dk_under,
-                fd.line as fd_line,
-                fd.over_odds as fd_over,
-                fd.under_odds as fd_under,
-                dk.game,
-                dk.team,
-                ABS(dk.line - fd.line) as line_difference
-            FROM dk_props dk
-            JOIN fd_props fd ON dk.player = fd.player AND dk.prop_type = fd.prop_type
-            WHERE ABS(dk.line - fd.line) >= ?
-            ORDER BY line_difference DESC
-        ''', (game_date, game_date, min_line_diff))
+        cursor.execute(self.FIND_LINE_DISCREPANCIES_SQL, (game_date, game_date, min_line_diff))
         
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
-        
-        return [dict(zip(columns, row)) for row in results]
+        return rows_as_dicts(cursor, self.LINE_DISCREPANCY_COLUMNS)
 
     def find_best_odds(self, game_date, min_odds_diff=10):
         """
         Find props where one book offers significantly better odds for the same line.
         min_odds_diff: minimum difference in American odds to be considered significant
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
-            WITH prop_comparison AS (
-                SELECT 
-                    player,
-                    prop_type,
-                    line,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN over_odds END) as dk_over,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN under_odds END) as dk_under,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN over_odds END) as fd_over,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN under_odds END) as fd_under,
-                    MAX(game) as game,
-                    MAX(team) as team
-                FROM player_props
-                WHERE game_date = ?
-                GROUP BY player, prop_type, line
-                HAVING COUNT(DISTINCT sportsbook) > 1
-            )
-            SELECT *
-            FROM prop_comparison
-            WHERE (ABS(dk_over - fd_over) >= ? AND dk_over IS NOT NULL AND fd_over IS NOT NULL)
-            OR (ABS(dk_under - fd_under) >= ? AND dk_under IS NOT NULL AND fd_under IS NOT NULL)
-        ''', (game_date, min_odds_diff, min_odds_diff))
-        
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
-        props = [dict(zip(columns, row)) for row in results]
-        
-        best_odds = []
-        
-        for prop in props:
-            # Compare over odds
-            if prop['dk_over'] and prop['fd_over']:
-                over_diff = abs(prop['dk_over'] - prop['fd_over'])
-                if over_diff >= min_odds_diff:
-                    best_book = 'DraftKings' if prop['dk_over'] > prop['fd_over'] else 'FanDuel'
-                    best_odds_value = max(prop['dk_over'], prop['fd_over'])
-                    worst_odds_value = min(prop['dk_over'], prop['fd_over'])
-                    
-                    best_odds.append({
-                        'player': prop['player'],
-                        'prop_type': prop['prop_type'],
-                        'line': prop['line'],
-                        'game': prop['game'],
-                        'team': prop['team'],
-                        'side': 'Over',
-                        'best_book': best_book,
-                        'best_odds': best_odds_value,
-                        'other_odds': worst_odds_value,
-                        'odds_difference': over_diff,
-                        'dk_odds': prop['dk_over'],
-                        'fd_odds': prop['fd_over']
-                    })
-            
-            # Compare under odds
-            if prop['dk_under'] and prop['fd_under']:
-                under_diff = abs(prop['dk_under'] - prop['fd_under'])
-                if under_diff >= min_odds_diff:
-                    best_book = 'DraftKings' if prop['dk_under'] > prop['fd_under'] else 'FanDuel'
-                    best_odds_value = max(prop['dk_under'], prop['fd_under'])
-                    worst_odds_value = min(prop['dk_under'], prop['fd_under'])
-                    
-                    best_odds.append({
-                        'player': prop['player'],
-                        'prop_type': prop['prop_type'],
-                        'line': prop['line'],
-                        'game': prop['game'],
-                        'team': prop['team'],
-                        'side': 'Under',
-                        'best_book': best_book,
-                        'best_odds': best_odds_value,
-                        'other_odds': worst_odds_value,
-                        'odds_difference': under_diff,
-                        'dk_odds': prop['dk_under'],
-                        'fd_odds': prop['fd_under']
-                    })
-        
-        return sorted(best_odds, key=lambda x: x['odds_difference'], reverse=True)
+        _, comparison = self.get_date_snapshot(game_date)
+        return scan_best_odds(comparison, min_odds_diff)
     
     def find_value_bets(self, game_date, min_edge=2.0, min_odds_diff=20):
         """
@@ -653,104 +1156,8 @@ class PropsDatabase:
         2. Sharp money indicators
         3. Odds discrepancies between books
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
-            WITH prop_comparison AS (
-                SELECT 
-                    player,
-                    prop_type,
-                    line,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN over_odds END) as dk_over,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN under_odds END) as dk_under,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN over_odds END) as fd_over,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN under_odds END) as fd_under,
-                    MAX(game) as game,
-                    MAX(team) as team
-                FROM player_props
-                WHERE game_date = ?
-                GROUP BY player, prop_type, line
-                HAVING COUNT(DISTINCT sportsbook) > 1
-            )
-            SELECT *
-            FROM prop_comparison
-            WHERE (ABS(dk_over - fd_over) >= ? OR ABS(dk_under - fd_under) >= ?)
-            OR (dk_over > 0 AND fd_over > 0)
-            OR (dk_under > 0 AND fd_under > 0)
-        ''', (game_date, min_odds_diff, min_odds_diff))
-        
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
-        props = [dict(zip(columns, row)) for row in results]
-        
-        value_bets = []
-        
-        for prop in props:
-            # Use the best odds from each book
-            best_over_odds = max([o for o in [prop['dk_over'], prop['fd_over']] if o]) if prop['dk_over'] or prop['fd_over'] else None
-            best_under_odds = max([o for o in [prop['dk_under'], prop['fd_under']] if o]) if prop['dk_under'] or prop['fd_under'] else None
-            
-            if not best_over_odds or not best_under_odds:
-                continue
-            
-            # Check for value on the over
-            value = find_value_bets(best_over_odds, best_under_odds, threshold=min_edge)
-            
-            # Check for sharp indicators
-            sharp = calculate_sharp_indicators(
-                prop['dk_over'], prop['dk_under'],
-                prop['fd_over'], prop['fd_under']
-            )
-            
-            # --- MODIFIED LOGIC ---
-            # Determine which side has the bigger discrepancy
-            over_diff = abs(prop['dk_over'] - prop['fd_over']) if prop['dk_over'] and prop['fd_over'] else 0
-            under_diff = abs(prop['dk_under'] - prop['fd_under']) if prop['dk_under'] and prop['fd_under'] else 0
-
-            # Only proceed if there's a significant odds difference
-            if over_diff < min_odds_diff and under_diff < min_odds_diff:
-                continue
-            
-            if over_diff > under_diff:
-                # Value is on the OVER
-                recommended_side = 'over'
-                best_book = 'DraftKings' if prop['dk_over'] > prop['fd_over'] else 'FanDuel'
-                best_odds = max(prop['dk_over'], prop['fd_over'])
-                edge_percent = over_diff / 10  # Simple edge calc based on diff
-                reasoning = "Odds discrepancy"
-            else:
-                # Value is on the UNDER
-                recommended_side = 'under'
-                best_book = 'DraftKings' if prop['dk_under'] > prop['fd_under'] else 'FanDuel'
-                best_odds = max(prop['dk_under'], prop['fd_under'])
-                edge_percent = under_diff / 10 # Simple edge calc based on diff
-                reasoning = "Odds discrepancy"
-
-            value_bet = {
-                'player': prop['player'],
-                'prop_type': prop['prop_type'],
-                'line': prop['line'],
-                'game': prop['game'],
-                'team': prop['team'],
-                'recommended_side': recommended_side,
-                'best_book': best_book,
-                'best_odds': best_odds,
-                'edge_percent': edge_percent,
-                'confidence': 'medium' if edge_percent > 15 else 'low',
-                'reasoning': reasoning,
-                'sharp_indicators': sharp,
-                'all_odds': {
-                    'dk_over': prop['dk_over'],
-                    'dk_under': prop['dk_under'],
-                    'fd_over': prop['fd_over'],
-                    'fd_under': prop['fd_under']
-                }
-            }
-            
-            value_bets.append(value_bet)
-        
-        # Sort by edge percentage (highest edge first)
-        return sorted(value_bets, key=lambda x: x['edge_percent'], reverse=True)
+        _, comparison = self.get_date_snapshot(game_date)
+        return scan_value_bets(comparison, min_edge, min_odds_diff)
 
     # <-- MODIFIED: Changed default min_odds_diff from 50 to 20 -->
     def find_consensus_bets(self, game_date, min_odds_diff=20):
@@ -758,147 +1165,159 @@ class PropsDatabase:
         Finds 'safe' bets where both books agree on the favored side (both < 0),
         but one book offers a significant discount (e.g., -130 vs -200).
         """
-        cursor = self.conn.cursor()
+        _, comparison = self.get_date_snapshot(game_date)
+        return scan_consensus_bets(comparison, min_odds_diff)
         
-        # Get all props where lines match and both books have odds
+    DASHBOARD_PAYLOAD_SQL = '''
+        SELECT payload FROM dashboard_cache
+        WHERE game_date = ? AND endpoint = ?
+    '''
+
+    def get_dashboard_payload(self, game_date, endpoint):
+        """Precomputed JSON body for an endpoint and date, or None if there isn't one"""
+        cursor = self.conn.cursor()
+        cursor.execute(self.DASHBOARD_PAYLOAD_SQL, (game_date, endpoint))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def get_dashboard_payloads(self, game_date):
+        """Every precomputed {endpoint: json_bytes} stored for a date"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT endpoint, payload FROM dashboard_cache WHERE game_date = ?", (game_date,))
+        return dict(cursor.fetchall())
+    
+    def save_dashboard_payloads(self, game_date, payloads):
+        """Store {endpoint: json_bytes} for a date, replacing what was there"""
+        generated_at = datetime.now().isoformat()
+        self.conn.execute("BEGIN IMMEDIATE")
+        with self.conn:
+            self.conn.executemany('''
+                INSERT OR REPLACE INTO dashboard_cache (game_date, endpoint, payload, generated_at)
+                VALUES (?, ?, ?, ?)
+            ''', [(game_date, endpoint, payload, generated_at) for endpoint, payload in payloads.items()])
+    
+    def get_uncached_dates(self, since):
+        """Dates from `since` on that have props but no precomputed analytics"""
+        cursor = self.conn.cursor()
         cursor.execute('''
-            WITH prop_comparison AS (
-                SELECT 
-                    player,
-                    prop_type,
-                    line,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN over_odds END) as dk_over,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'draftkings' THEN under_odds END) as dk_under,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN over_odds END) as fd_over,
-                    MAX(CASE WHEN LOWER(sportsbook) = 'fanduel' THEN under_odds END) as fd_under,
-                    MAX(game) as game,
-                    MAX(team) as team
-                FROM player_props
-                WHERE game_date = ?
-                GROUP BY player, prop_type, line
-                HAVING COUNT(DISTINCT sportsbook) > 1 
-                   AND dk_over IS NOT NULL AND dk_under IS NOT NULL
-                   AND fd_over IS NOT NULL AND fd_under IS NOT NULL
-            )
-            SELECT *
-            FROM prop_comparison
-            WHERE 
-                -- Both OVERs are favored AND there's a big difference
-                ( (dk_over < 0 AND fd_over < 0) AND ABS(dk_over - fd_over) >= ? )
-                OR
-                -- Both UNDERs are favored AND there's a big difference
-                ( (dk_under < 0 AND fd_under < 0) AND ABS(dk_under - fd_under) >= ? )
-        ''', (game_date, min_odds_diff, min_odds_diff))
-        
-        columns = [description[0] for description in cursor.description]
-        results = cursor.fetchall()
-        props = [dict(zip(columns, row)) for row in results]
-        
-        consensus_bets = []
-        
-        for prop in props:
-            # Check OVER consensus
-            if prop['dk_over'] < 0 and prop['fd_over'] < 0:
-                over_diff = abs(prop['dk_over'] - prop['fd_over'])
-                if over_diff >= min_odds_diff:
-                    # Find the better (less negative) odds
-                    best_book = 'DraftKings' if prop['dk_over'] > prop['fd_over'] else 'FanDuel'
-                    best_odds = max(prop['dk_over'], prop['fd_over'])
-                    worst_odds = min(prop['dk_over'], prop['fd_over'])
-                    
-                    consensus_bets.append({
-                        'player': prop['player'],
-                        'prop_type': prop['prop_type'],
-                        'line': prop['line'],
-                        'game': prop['game'],
-                        'team': prop['team'],
-                        'side': 'Over',
-                        'best_book': best_book,
-                        'best_odds': best_odds,
-                        'other_odds': worst_odds,
-                        'odds_difference': over_diff,
-                        'reasoning': f"Market consensus favors Over. Get {over_diff} point discount."
-                    })
-
-            # Check UNDER consensus
-            if prop['dk_under'] < 0 and prop['fd_under'] < 0:
-                under_diff = abs(prop['dk_under'] - prop['fd_under'])
-                if under_diff >= min_odds_diff:
-                    # Find the better (less negative) odds
-                    best_book = 'DraftKings' if prop['dk_under'] > prop['fd_under'] else 'FanDuel'
-                    best_odds = max(prop['dk_under'], prop['fd_under'])
-                    worst_odds = min(prop['dk_under'], prop['fd_under'])
-                    
-                    consensus_bets.append({
-                        'player': prop['player'],
-                        'prop_type': prop['prop_type'],
-                        'line': prop['line'],
-                        'game': prop['game'],
-                        'team': prop['team'],
-                        'side': 'Under',
-                        'best_book': best_book,
-                        'best_odds': best_odds,
-                        'other_odds': worst_odds,
-                        'odds_difference': under_diff,
-                        'reasoning': f"Market consensus favors Under. Get {under_diff} point discount."
-                    })
-
-        return sorted(consensus_bets, key=lambda x: x['odds_difference'], reverse=True)
-        
+            SELECT DISTINCT game_date FROM player_props
+            WHERE game_date >= ? AND game_date NOT IN (SELECT game_date FROM dashboard_cache)
+            ORDER BY game_date
+        ''', (since,))
+        return [row[0] for row in cursor.fetchall()]
+    
+    def evict_dashboard_payloads(self, before, endpoints):
+        """Drop payloads for dates before `before` and for endpoints no longer precomputed"""
+        placeholders = ', '.join('?' * len(endpoints))
+        self.conn.execute("BEGIN IMMEDIATE")
+        with self.conn:
+            self.conn.execute(f'''
+                DELETE FROM dashboard_cache
+                WHERE game_date < ? OR endpoint NOT IN ({placeholders})
+            ''', (before, *endpoints))
+    
     def close(self):
-        self.conn.close()
+        """Close the calling thread's connection (other threads' connections close when they exit)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            if not self.read_only:
+                try:
+                    # Refreshes planner stats only where they've gone stale
+                    conn.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    print(f"  Warning: PRAGMA optimize failed: {e}")
+            conn.close()
+            self._local.conn = None
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None  # Reopened if the instance is used again
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        # Roll back a write left open by an exception before closing
+        conn = getattr(self._local, 'conn', None)
+        if exc_type is not None and conn is not None and conn.in_transaction:
+            conn.rollback()
+        self.close()
+        return False
+
+# Most date files written at once by save_props
+JSON_WRITE_WORKERS = 8
+
+# Analyses refresh_dashboard_cache stores per date, in /api/dashboard order.
+# Props aren't stored: they are the date's rows, read back live
+DASHBOARD_SECTIONS = ('arbitrage', 'discrepancies', 'best_odds', 'value_bets', 'consensus_bets')
+# Dates older than this many days are neither precomputed nor kept
+DASHBOARD_CACHE_DAYS = 2
 
 class PropsManager:
-    def __init__(self, base_folder="props_data", use_db=True):
+    def __init__(self, base_folder="props_data", use_db=True, read_only=False):
         self.base_folder = base_folder
         self.use_db = use_db
         if use_db:
             db_path = os.path.join(base_folder, "props.db")
-            self.db = PropsDatabase(db_path)
+            self.db = PropsDatabase(db_path, read_only=read_only)
     
     def save_props(self, props, sportsbook):
-        """Save to both JSON (backup) and SQLite (querying)"""
+        """Save to both JSON (backup) and SQLite (querying); takes Prop objects or dicts"""
         if not props:
             print("No props to save")
             return
         
+        props = [prop.as_dict() if isinstance(prop, Prop) else prop for prop in props]
+        
         grouped = defaultdict(list)
         for prop in props:
             grouped[prop['game_date']].append(prop)
         
-        for date, props_list in grouped.items():
-            # Save to JSON (organized by year/month)
-            json_path = get_output_path(self.base_folder, sportsbook, date)
-            self._save_json(json_path, props_list)
-            
-            # Save to database
-            if self.use_db:
-                self.db.insert_props(props_list, sportsbook)
+        # Save to JSON (organized by year/month). Every date is its own file,
+        # so several dates are written concurrently, overlapping the database save
+        if len(grouped) == 1:
+            date, props_list = next(iter(grouped.items()))
+            self._save_json(get_output_path(self.base_folder, sportsbook, date), props_list)
+            self._save_db(props, sportsbook)
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(JSON_WRITE_WORKERS, len(grouped))) as pool:
+            writes = [pool.submit(self._save_json, get_output_path(self.base_folder, sportsbook, date), props_list)
+                      for date, props_list in grouped.items()]
+            self._save_db(props, sportsbook)
+        for write in writes:
+            write.result()  # Re-raise a failed write, as the serial loop did
+    
+    def _save_db(self, props, sportsbook):
+        # Save to database: every date in one transaction (one commit per scrape)
+        if self.use_db:
+            self.db.insert_props(props, sportsbook)
     
     def _save_json(self, file_path, props_list):
         """Helper to save JSON with deduplication"""
-        existing_props = []
+        # Remove duplicates (keep latest): new props overwrite existing ones
+        unique_props = {}
         if os.path.exists(file_path):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    existing_props = json.load(f)
-            except json.JSONDecodeError:
+                with open(file_path, 'rb') as f:
+                    for prop in orjson.loads(f.read()):
+                        unique_props[(prop['player'], prop['prop_type'], prop['line'])] = prop
+            except json.JSONDecodeError:  # orjson's error subclasses it
                 print(f"  ⚠️  Warning: Could not read existing {file_path}, overwriting...")
-                existing_props = []
-        
-        all_props = existing_props + props_list
+                unique_props = {}
         
-        # Remove duplicates (keep latest)
-        unique_props = {}
-        for prop in all_props:
-            key = (prop['player'], prop['prop_type'], prop['line'])
-            unique_props[key] = prop
+        for prop in props_list:
+            unique_props[(prop['player'], prop['prop_type'], prop['line'])] = prop
         
         final_props = list(unique_props.values())
         
+        # Compact output (indent=2 roughly doubled the file), written to a temp
+        # file and swapped in so a crash never leaves a half-written backup
+        tmp_path = file_path + ".tmp"
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(final_props, f, indent=2, ensure_ascii=False)
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(final_props))
+            os.replace(tmp_path, file_path)
             print(f"  ✅ Saved {len(final_props)} props to {file_path}")
         except Exception as e:
             print(f"  ❌ Error saving JSON: {e}")
@@ -909,6 +1328,11 @@ class PropsManager:
             return self.db.get_props_for_date(game_date, sportsbook)
         return []
     
+    def get_daily_summary(self, game_date):
+        """Prop counts for a date: total plus one entry per sportsbook"""
+        counts = self.db.get_prop_counts(game_date) if self.use_db else {}
+        return {'total': sum(counts.values()), **counts}
+    
     def get_player_history(self, player_name, prop_type, days=30):
         """Get player history from database"""
         if self.use_db:
@@ -945,6 +1369,12 @@ class PropsManager:
             return self.db.get_all_props_for_comparison(game_date)
         return []
     
+    def iter_all_props_comparison(self, game_date):
+        """Stream all props for comparison without building the full list"""
+        if self.use_db:
+            return self.db.iter_all_props_for_comparison(game_date)
+        return iter(())
+    
     def find_value_bets(self, game_date, min_edge=2.0, min_odds_diff=20):
         """Find value betting opportunities based on odds discrepancies"""
         if self.use_db:
@@ -958,8 +1388,81 @@ class PropsManager:
         if self.use_db:
             return self.db.find_consensus_bets(game_date, min_odds_diff=min_odds_diff)
         return []
+    
+    def get_dashboard(self, game_date, min_profit=0.1, min_line_diff=0.5, best_odds_diff=5,
+                      min_edge=1.5, value_odds_diff=20, consensus_odds_diff=20, executor=None):
+        """
+        Everything the dashboard shows for a date, from one cached snapshot.
+        Defaults match the thresholds used by the individual API routes.
+        With an executor, the independent analyses run concurrently on it
+        (they only read the shared snapshot, so no locking is needed).
+        """
+        props, comparison = self.db.get_date_snapshot(game_date) if self.use_db else ([], [])
+        analyses = {
+            'arbitrage': (scan_arbitrage, comparison, min_profit),
+            'discrepancies': (scan_line_discrepancies, props, min_line_diff),
+            'best_odds': (scan_best_odds, comparison, best_odds_diff),
+            'value_bets': (scan_value_bets, comparison, min_edge, value_odds_diff),
+            'consensus_bets': (scan_consensus_bets, comparison, consensus_odds_diff)
+        }
+        
+        dashboard = {'props': props}
+        if executor is None:
+            for name, (scan, *args) in analyses.items():
+                dashboard[name] = scan(*args)
+        else:
+            futures = {name: executor.submit(*task) for name, task in analyses.items()}
+            wait(futures.values())
+            for name, future in futures.items():
+                dashboard[name] = future.result()  # Re-raises a failed analysis
+        return dashboard
+    
+    def get_dashboard_payload(self, game_date, endpoint):
+        """
+        JSON body stored by refresh_dashboard_cache, or None. The 'dashboard'
+        body isn't stored: it is assembled from the stored sections plus the
+        date's props, which are already in the database as rows.
+        """
+        if not self.use_db:
+            return None
+        if endpoint != 'dashboard':
+            return self.db.get_dashboard_payload(game_date, endpoint)
+        sections = self.db.get_dashboard_payloads(game_date)
+        if any(name not in sections for name in DASHBOARD_SECTIONS):
+            return None
+        props, _ = self.db.get_date_snapshot(game_date)
+        parts = [b'"props":' + orjson.dumps(props)]
+        parts.extend(b'"%s":%s' % (name.encode(), sections[name]) for name in DASHBOARD_SECTIONS)
+        return b'{' + b','.join(parts) + b'}'
+    
+    def refresh_dashboard_cache(self, game_dates=None):
+        """
+        Run the dashboard analytics once per date and store each section's
+        encoded result. Defaults to the dates from DASHBOARD_CACHE_DAYS back on
+        whose cache was invalidated by new props; payloads for older dates are
+        evicted, since the dashboard only looks at current slates.
+        """
+        if not self.use_db:
+            return []
+        since = (datetime.now() - timedelta(days=DASHBOARD_CACHE_DAYS)).strftime('%Y-%m-%d')
+        self.db.evict_dashboard_payloads(since, DASHBOARD_SECTIONS)
+        if game_dates is None:
+            game_dates = self.db.get_uncached_dates(since)
+        for game_date in game_dates:
+            dashboard = self.get_dashboard(game_date)
+            self.db.save_dashboard_payloads(
+                game_date, {name: orjson.dumps(dashboard[name]) for name in DASHBOARD_SECTIONS})
+        return game_dates
 
     def close(self):
         if self.use_db:
             self.db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self.use_db:
+            return self.db.__exit__(exc_type, exc, tb)
+        return False
 
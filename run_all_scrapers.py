@@ -6,9 +6,13 @@ Run this daily to get fresh props data.
 
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from scrape_draftkings import create_fresh_session, MAX_CONCURRENT_FETCHES as DK_FETCHES
 from scrape_draftkings import run_nba_scraper as run_dk_scraper
+from scrape_fanduel import MAX_CONCURRENT_FETCHES as FD_FETCHES
 from scrape_fanduel import run_scraper as run_fd_scraper
+from props_manager import PropsManager
 
 def print_banner(text):
     """Print a nice banner"""
@@ -17,6 +21,7 @@ def print_banner(text):
     print("="*80 + "\n")
 
 def main():
+    """Run every scraper and return the per-book results dict"""
     start_time = time.time()
     
     print_banner("🏀 NBA PROPS MASTER SCRAPER")
@@ -29,28 +34,32 @@ def main():
         'fanduel': {'success': False, 'error': None}
     }
     
-    # Run DraftKings scraper
-    print_banner("STEP 1: Scraping DraftKings")
-    try:
-        run_dk_scraper()
-        results['draftkings']['success'] = True
-        print("✅ DraftKings scraping completed successfully!")
-    except Exception as e:
-        results['draftkings']['error'] = str(e)
-        print(f"❌ DraftKings scraping failed: {e}")
+    # One pooled session for both books, so connections are reused across
+    # every request of the run instead of being set up per scraper
+    session = create_fresh_session(pool_size=max(DK_FETCHES, FD_FETCHES))
+    # Likewise one manager (one database connection) for every save and the
+    # status checks below
+    manager = PropsManager(base_folder="props_data", use_db=True)
     
-    # Small delay between scrapers
-    time.sleep(3)
+    def run_book(book, label, scraper):
+        try:
+            scraper(session, manager)
+            results[book]['success'] = True
+            print(f"✅ {label} scraping completed successfully!")
+        except Exception as e:
+            results[book]['error'] = str(e)
+            print(f"❌ {label} scraping failed: {e}")
+        finally:
+            # Saves ran on this worker's own database connection
+            manager.close()
     
-    # Run FanDuel scraper
-    print_banner("STEP 2: Scraping FanDuel")
-    try:
-        run_fd_scraper()
-        results['fanduel']['success'] = True
-        print("✅ FanDuel scraping completed successfully!")
-    except Exception as e:
-        results['fanduel']['error'] = str(e)
-        print(f"❌ FanDuel scraping failed: {e}")
+    # The books are different hosts with nothing shared, so scrape both at
+    # once instead of one after the other with a pause in between
+    print_banner("Scraping DraftKings and FanDuel")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pool.submit(run_book, 'draftkings', 'DraftKings', run_dk_scraper)
+        pool.submit(run_book, 'fanduel', 'FanDuel', run_fd_scraper)
+    session.close()
     
     # Summary
     elapsed_time = time.time() - start_time
@@ -70,21 +79,16 @@ def main():
     # Check database
     print_banner("DATABASE STATUS")
     try:
-        from props_manager import PropsManager
-        manager = PropsManager(base_folder="props_data", use_db=True)
-        
         # Get today's date
         today = datetime.now().strftime('%Y-%m-%d')
         
-        # Check props for today
-        props_today = manager.get_props_for_date(today)
-        dk_props = manager.get_props_for_date(today, sportsbook='draftkings')
-        fd_props = manager.get_props_for_date(today, sportsbook='fanduel')
+        # Check props for today (one grouped count instead of three full fetches)
+        summary = manager.get_daily_summary(today)
         
         print(f"Props for {today}:")
-        print(f"  Total: {len(props_today)}")
-        print(f"  DraftKings: {len(dk_props)}")
-        print(f"  FanDuel: {len(fd_props)}")
+        print(f"  Total: {summary['total']}")
+        print(f"  DraftKings: {summary.get('draftkings', 0)}")
+        print(f"  FanDuel: {summary.get('fanduel', 0)}")
         
         # Get arbitrage opportunities
         arbs = manager.find_arbitrage(today, min_profit=0.1)
@@ -96,20 +100,24 @@ def main():
         print(f"  Line Discrepancies: {len(discs)}")
         print(f"  Best Odds: {len(best)}")
         
-        manager.close()
+        # Materialize the dashboard analytics so the API just looks them up
+        refreshed = manager.refresh_dashboard_cache()
+        print(f"\nPrecomputed dashboard data for {len(refreshed)} date(s)")
         
     except Exception as e:
         print(f"❌ Error checking database: {e}")
+    manager.close()
     
     print("\n" + "="*80)
     print("✅ All done! Your dashboard is ready to use.")
     print("="*80 + "\n")
     
-    # Exit with appropriate code
-    if results['draftkings']['success'] or results['fanduel']['success']:
-        sys.exit(0)  # Success if at least one worked
-    else:
-        sys.exit(1)  # Failure if both failed
+    return results
+
+def any_succeeded(results):
+    """True if at least one scraper worked"""
+    return any(r['success'] for r in results.values())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Exit with appropriate code: success if at least one worked
+    sys.exit(0 if any_succeeded(main()) else 1)
\ No newline at end of file
@@ -1,13 +1,16 @@
 import requests
-import json
+import orjson
+import functools
 import os
 import time
 import random
 import re
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from dateutil import tz
-from props_manager import PropsManager
+from props_manager import PropsManager, Prop, clean_odds_value
+from http_cache import HttpCache, RETRY
 
 # --- CONFIGURATION ---
 REGION_CODE = "dkusoh"
@@ -27,52 +30,92 @@ PLAYER_PROP_CATEGORIES = {
     'Steals + Blocks': '13781'
 }
 
+# Game dates are the US Eastern calendar day; resolved once, not per market
+EASTERN_TZ = tz.gettz('America/New_York')
+
+# Categories are independent requests; fetch a few at once instead of in series
+MAX_CONCURRENT_FETCHES = 4
+
+# Odds move; a category fetched this recently is reused without a request
+ODDS_CACHE_TTL = 60
+
 # --- SESSION SETUP ---
-def create_fresh_session():
-    """Create a new session with fresh headers to avoid caching"""
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+    "Referer": "https://sportsbook.draftkings.com/",
+    "Origin": "https://sportsbook.draftkings.com",
+    "Accept": "*/*",
+}
+
+def create_fresh_session(pool_size=MAX_CONCURRENT_FETCHES):
+    """
+    Create a new pooled session. Headers go with each request rather than on
+    the session, so run_all_scrapers can share one session across both books.
+    """
     session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
-        "Referer": "https://sportsbook.draftkings.com/",
-        "Origin": "https://sportsbook.draftkings.com",
-        "Accept": "*/*",
-        "Cache-Control": "no-cache, no-store, must-revalidate",
-        "Pragma": "no-cache",
-        "Expires": "0",
-    })
+    # Keep one pooled connection per concurrent fetch, per host
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=RETRY)
+    session.mount("https://", adapter)
     return session
 
 # --- FETCH PROP DATA ---
-def fetch_props(session, subcategory_id, prop_name):
-    # Add timestamp to bust any caching
-    timestamp = int(time.time() * 1000)
-    
+def fetch_props(session, subcategory_id, prop_name, http_cache):
+    # No cache-busting parameter: http_cache reuses a fresh copy, then
+    # revalidates against ETag/Last-Modified, so an unchanged category costs a 304
     url = (
         f"https://sportsbook-nash.draftkings.com/sites/US-OH-SB/api/sportscontent/controldata/"
         f"league/leagueSubcategory/v1/markets?isBatchable=false&templateVars={LEAGUE_ID}%2C{subcategory_id}"
         f"&eventsQuery=%24filter%3DleagueId%20eq%20%27{LEAGUE_ID}%27%20AND%20clientMetadata%2FSubcategories%2Fany%28s%3A%20s%2FId%20eq%20%27{subcategory_id}%27%29"
         f"&marketsQuery=%24filter%3DclientMetadata%2FsubCategoryId%20eq%20%27{subcategory_id}%27%20AND%20tags%2Fall%28t%3A%20t%20ne%20%27SportcastBetBuilder%27%29&include=Events&entity=events"
-        f"&_={timestamp}"
     )
     print(f"Fetching '{prop_name}' props...")
     try:
-        response = session.get(url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        body, from_cache = http_cache.get(session, url, headers=HEADERS, timeout=30, ttl=ODDS_CACHE_TTL)
+        # orjson parses the multi-MB market payloads several times faster than response.json()
+        data = orjson.loads(body)
         
         # Check for actual market data
         markets = data.get('markets', [])
         selections = data.get('selections', [])
         
-        print(f"  ✅ '{prop_name}' data received - {len(markets)} markets, {len(selections)} selections")
+        status = "reused from cache" if from_cache else "data received"
+        print(f"  ✅ '{prop_name}' {status} - {len(markets)} markets, {len(selections)} selections")
         print(f"  ⏰ Fetched at: {datetime.now().strftime('%H:%M:%S')}")
         
         return data
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"  ❌ Error fetching '{prop_name}': {e}")
         return None
 
 # --- PARSE PROP DATA ---
+SELECTION_SLOTS = {'Over': 0, 'Under': 1, 'over': 0, 'under': 1}
+
+@functools.lru_cache(maxsize=32)
+def _player_name_pattern(search_name):
+    """Matches where a category's first word starts in a market name; compiled once per category"""
+    return re.compile(r'\b' + re.escape(search_name), re.IGNORECASE)
+
+_EVENT_START_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}')
+
+def event_game_date(start_event_date_str):
+    """Eastern calendar date of an event's start time (None if it has none)"""
+    if not start_event_date_str:
+        return None
+    # Anything not shaped like a timestamp takes the plain prefix without
+    # going through a parse that would only raise
+    if not _EVENT_START_RE.match(start_event_date_str):
+        return start_event_date_str.split('T')[0]
+    try:
+        if start_event_date_str.endswith('Z'):
+            start_event_date_str = start_event_date_str[:-1] + '+00:00'
+        
+        utc_time = datetime.fromisoformat(start_event_date_str)
+        local_time = utc_time.astimezone(EASTERN_TZ)
+        return local_time.strftime('%Y-%m-%d')
+    except ValueError:
+        # Matched the timestamp shape, so the date is the first 10 characters
+        return start_event_date_str[:10]
+
 def parse_props(data, prop_type_name):
     if not data:
         return []
@@ -82,67 +125,78 @@ def parse_props(data, prop_type_name):
     selections = data.get('selections', [])
 
     event_map = {event['id']: event for event in events}
+    # Markets share events (a dozen or more props per game), so each
+    # event's date is parsed once here instead of once per market
+    event_dates = {event_id: event_game_date(event.get('startEventDate'))
+                   for event_id, event in event_map.items()}
+    today = datetime.today().strftime('%Y-%m-%d')
 
-    selections_by_market = defaultdict(dict)
+    # [over, under] selection per market; a later selection for a side wins
+    selections_by_market = {}
     for sel in selections:
         market_id = sel.get('marketId')
-        label = sel.get('label', '').lower()
-        if market_id and label in ['over', 'under']:
-            selections_by_market[market_id][label] = sel
+        label = sel.get('label', '')
+        # Labels come as "Over"/"Under"; other casings take the lower() fallback
+        slot = SELECTION_SLOTS.get(label)
+        if slot is None:
+            slot = SELECTION_SLOTS.get(label.lower())
+        if market_id and slot is not None:
+            selections_by_market.setdefault(market_id, [None, None])[slot] = sel
 
+    # Player name is whatever precedes the category's first word
+    name_pattern = _player_name_pattern(prop_type_name.split(' ')[0])
+    ou_suffix = f" {prop_type_name} O/U"
+    prop_type = prop_type_name.lower()
+    
     parsed_props = []
     for market in markets:
         market_id = market.get('id')
-        outcomes = selections_by_market.get(market_id)
-        if not outcomes or 'over' not in outcomes or 'under' not in outcomes:
+        over_sel, under_sel = selections_by_market.get(market_id, (None, None))
+        if over_sel is None or under_sel is None:
             continue
-        over_sel = outcomes['over']
-        under_sel = outcomes['under']
 
         # Find player name from market name
-        search_name = prop_type_name.split(' ')[0]
         market_name = market['name']
-        match = re.search(r'\b' + re.escape(search_name), market_name, re.IGNORECASE)
+        match = name_pattern.search(market_name)
         if match:
             player_name = market_name[:match.start()].strip()
         else:
-            player_name = market_name.replace(f" {prop_type_name} O/U", "").strip()
+            player_name = market_name.replace(ou_suffix, "").strip()
 
         # Event date
         event_id = market.get('eventId')
         event = event_map.get(event_id, {})
-        start_event_date_str = event.get('startEventDate')
-        
-        if start_event_date_str:
-            try:
-                if start_event_date_str.endswith('Z'):
-                    start_event_date_str = start_event_date_str[:-1] + '+00:00'
-                
-                utc_time = datetime.fromisoformat(start_event_date_str)
-                eastern_tz = tz.gettz('America/New_York')
-                local_time = utc_time.astimezone(eastern_tz)
-                game_date = local_time.strftime('%Y-%m-%d')
-            except ValueError:
-                game_date = start_event_date_str.split('T')[0]
-        else:
-            game_date = datetime.today().strftime('%Y-%m-%d')
-
-        parsed_props.append({
-            'player': player_name.lower(),
-            'game': event.get('name', 'Unknown Game'),
-            'prop_type': prop_type_name.lower(),
-            'line': over_sel.get('points'),
-            'over_odds': over_sel.get('displayOdds', {}).get('american'),
-            'under_odds': under_sel.get('displayOdds', {}).get('american'),
-            'sportsbook': 'DraftKings',
-            'game_date': game_date
-        })
+        game_date = event_dates.get(event_id)
+        if game_date is None:
+            game_date = today
+
+        # DK displays odds as text with a unicode minus; store plain ints.
+        # Odds that are present but don't parse drop the prop, as insert_props
+        # did when it still saw the raw text
+        raw_over = over_sel.get('displayOdds', {}).get('american')
+        raw_under = under_sel.get('displayOdds', {}).get('american')
+        over_odds = clean_odds_value(raw_over)
+        under_odds = clean_odds_value(raw_under)
+        if (raw_over is not None and over_odds is None) or (raw_under is not None and under_odds is None):
+            print(f"Warning: Invalid odds '{raw_over}'/'{raw_under}' for {player_name} - skipping")
+            continue
+
+        parsed_props.append(Prop(
+            player=player_name.lower(),
+            game=event.get('name', 'Unknown Game'),
+            prop_type=prop_type,
+            line=over_sel.get('points'),
+            over_odds=over_odds,
+            under_odds=under_odds,
+            sportsbook='DraftKings',
+            game_date=game_date,
+        ))
 
     print(f"  -> Found {len(parsed_props)} {prop_type_name} props")
     return parsed_props
 
 # --- MAIN EXECUTION ---
-def run_nba_scraper():
+def run_nba_scraper(session=None, manager=None):
     all_props = []
     scrape_start = datetime.now()
     
@@ -151,17 +205,29 @@ def run_nba_scraper():
     print(f"Started: {scrape_start.strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*80 + "\n")
     
-    # Create fresh session for each run
-    session = create_fresh_session()
+    # Create fresh session for each run unless the caller shares one
+    owns_session = session is None
+    if owns_session:
+        session = create_fresh_session()
+    
+    http_cache = HttpCache('draftkings')
+    
+    def fetch(category):
+        prop_name, sub_id = category
+        # Small random stagger so the concurrent requests don't land as one burst
+        time.sleep(random.uniform(0, 0.5))
+        return fetch_props(session, sub_id, prop_name, http_cache)
     
-    for prop_name, sub_id in PLAYER_PROP_CATEGORIES.items():
-        data = fetch_props(session, sub_id, prop_name)
+    # The network waits overlap; parsing stays here, in category order
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as pool:
+        responses = list(pool.map(fetch, PLAYER_PROP_CATEGORIES.items()))
+    http_cache.save()
+    if owns_session:
+        session.close()
+    
+    for prop_name, data in zip(PLAYER_PROP_CATEGORIES, responses):
         props = parse_props(data, prop_name)
         all_props.extend(props)
-        
-        # Random delay between requests
-        delay = random.uniform(1.5, 3.0)
-        time.sleep(delay)
 
     print(f"\n{'='*80}")
     print(f"SCRAPED {len(all_props)} TOTAL PROPS")
@@ -170,9 +236,12 @@ def run_nba_scraper():
     if all_props:
         # Use PropsManager to save
         print("Saving to database and JSON files...")
-        manager = PropsManager(base_folder="props_data", use_db=True)
-        manager.save_props(all_props, "draftkings")
-        manager.close()
+        # Reuse the caller's manager (and its connection) when given one
+        if manager is not None:
+            manager.save_props(all_props, "draftkings")
+        else:
+            with PropsManager(base_folder="props_data", use_db=True) as manager:
+                manager.save_props(all_props, "draftkings")
         
         scrape_end = datetime.now()
         duration = (scrape_end - scrape_start).total_seconds()
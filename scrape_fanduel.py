@@ -1,51 +1,74 @@
 import requests
-import json
-import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
 import os # 
-from props_manager import PropsManager
+from props_manager import PropsManager, Prop
+from http_cache import HttpCache, RETRY
 from dateutil import tz
 
-def get_nba_main_page_data():
+# SCRAPER_VERBOSE=1 prints every prop as it's parsed (two lines each);
+# otherwise only the per-tab counts are shown
+VERBOSE = os.environ.get("SCRAPER_VERBOSE") == "1"
+
+# Game dates are the US Eastern calendar day; resolved once, not per event
+EASTERN_TZ = tz.gettz('America/New_York')
+
+# Event and tab pages are independent requests; this many run at once
+MAX_CONCURRENT_FETCHES = 8
+
+# Games whose tab layouts are combined into the one used for every game
+TAB_SAMPLE_GAMES = 3
+
+# Seconds a cached page is reused without a request: the schedule and each
+# game's tab layout change rarely, odds move
+EVENTS_CACHE_TTL = 300
+ODDS_CACHE_TTL = 60
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36',
+    'x-sportsbook-region': 'OH',
+}
+
+# Tabs that are clearly not player props
+# Updated to include the noisy tabs we found
+SKIPPED_TABS = frozenset({
+    'game-lines', 'popular', 'odds', 'same-game-parlay', 'quick-bets',
+    'half', 'quarter', '4th-quarter', '1st-quarter', '2nd-quarter', '3rd-quarter',
+    'total-parlays', 'team-props', 'race-to', 'margin', 'parlays', 'teasers',
+    'featured', 'live-sgp', 'same-game-parlay™',
+})
+
+def create_session():
+    """Pooled session reused for every request of a run (keep-alive instead of a new TLS handshake each call)"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_FETCHES,
+                                          max_retries=RETRY))
+    return session
+
+def get_nba_main_page_data(session, http_cache):
     """Fetches the main NBA page and returns the raw data needed for parsing."""
     url = "https://api.sportsbook.fanduel.com/sbapi/content-managed-page?page=CUSTOM&customPageId=nba&pbHorizontal=false&_ak=FhMFpcPWXMeyZxOx&timezone=America%2FNew_York"
-    # In scrape_fanduel.py - update all headers
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36',
-        'x-sportsbook-region': 'OH',
-        'Cache-Control': 'no-cache, no-store, must-revalidate',  # Add this
-        'Pragma': 'no-cache',  # Add this
-        'Expires': '0'  # Add this
-    }
     try:
         # Add a timeout to the request
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        body, _ = http_cache.get(session, url, headers=HEADERS, timeout=15, ttl=EVENTS_CACHE_TTL)
+        return orjson.loads(body)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching NBA main page: {e}")
         return None
 
-def get_all_available_tabs(event_id):
+def get_all_available_tabs(session, event_id, http_cache):
     """
     Fetch the event page to see what tabs are actually available.
     This call does NOT get all the markets, just the tab layout.
     """
-    cache_buster = int(time.time())
-    url = f"https://api.sportsbook.fanduel.com/sbapi/event-page?_ak=FhMFpcPWXMeyZxOx&eventId={event_id}&_={cache_buster}"
-    # In scrape_fanduel.py - update all headers
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36',
-        'x-sportsbook-region': 'OH',
-        'Cache-Control': 'no-cache, no-store, must-revalidate',  # Add this
-        'Pragma': 'no-cache',  # Add this
-        'Expires': '0'  # Add this
-    }
+    # Stable URL (no cache-buster) so the cache can key on it
+    url = f"https://api.sportsbook.fanduel.com/sbapi/event-page?_ak=FhMFpcPWXMeyZxOx&eventId={event_id}"
     try:
         # Add a timeout to the request
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        data = response.json()
+        body, _ = http_cache.get(session, url, headers=HEADERS, timeout=15, ttl=EVENTS_CACHE_TTL)
+        data = orjson.loads(body)
         
         # Extract tab information
         tabs = data.get('layout', {}).get('tabs', {})
@@ -56,11 +79,7 @@ def get_all_available_tabs(event_id):
             tab_name = tab_title.lower().replace(' ', '-')
             
             # Filter out tabs that are clearly not player props
-            # Updated to include the noisy tabs we found
-            if tab_name in ['game-lines', 'popular', 'odds', 'same-game-parlay', 'quick-bets',
-                            'half', 'quarter', '4th-quarter', '1st-quarter', '2nd-quarter', '3rd-quarter',
-                            'total-parlays', 'team-props', 'race-to', 'margin', 'parlays', 'teasers',
-                            'featured', 'live-sgp', 'same-game-parlay™']:
+            if tab_name in SKIPPED_TABS:
                 continue
 
             available_tabs.append({
@@ -73,31 +92,69 @@ def get_all_available_tabs(event_id):
         print(f"Error fetching tabs for event {event_id}: {e}")
         return []
 
-def get_player_props(event_id, prop_tab_name):
+def get_player_props(session, event_id, prop_tab_name, http_cache):
     """
     Fetches the player props for a specific game (event_id) and string-based prop tab name.
     """
-    cache_buster = int(time.time())
     # Use the string name (e.g., 'player-points') as the 'tab' parameter
-    url = f"https://api.sportsbook.fanduel.com/sbapi/event-page?_ak=FhMFpcPWXMeyZxOx&eventId={event_id}&tab={prop_tab_name}&_={cache_buster}"
-    # In scrape_fanduel.py - update all headers
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36',
-        'x-sportsbook-region': 'OH',
-        'Cache-Control': 'no-cache, no-store, must-revalidate',  # Add this
-        'Pragma': 'no-cache',  # Add this
-        'Expires': '0'  # Add this
-    }
+    url = f"https://api.sportsbook.fanduel.com/sbapi/event-page?_ak=FhMFpcPWXMeyZxOx&eventId={event_id}&tab={prop_tab_name}"
     try:
         # --- MODIFICATION: Added print statement and timeout ---
         print(f"    ... requesting {prop_tab_name} data from API...")
-        response = requests.get(url, headers=headers, timeout=15) # 15-second timeout
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        body, _ = http_cache.get(session, url, headers=HEADERS, timeout=15, ttl=ODDS_CACHE_TTL) # 15-second timeout
+        # Event pages are the largest payloads; orjson parses them far faster than response.json()
+        return orjson.loads(body)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching props for event {event_id}, tab {prop_tab_name}: {e}")
         return None
 
+def player_markets(prop_data):
+    """
+    An event page's player O/U markets as (player_name, prop_type, market),
+    or None if the page came back without markets. Game lines, alts,
+    quarters and yes/no props are dropped here, right after the fetch, so
+    only the kept markets outlive the parsed page.
+    """
+    if not prop_data or 'attachments' not in prop_data or 'markets' not in prop_data['attachments']:
+        return None
+    
+    kept = []
+    for market in prop_data['attachments']['markets'].values():
+        market_type = market.get('marketType', '')
+
+        # Team and game markets are the bulk of the page; drop them on the
+        # type alone, before the name is even looked up
+        if not market_type.startswith('PLAYER_'):
+            continue
+
+        market_name = market.get('marketName', '')
+        if 'TOTAL' not in market_type:
+            if not (market_type == "PLAYER_PROPS" and "O/U" in market_name):
+                continue
+
+        if " - " not in market_name:
+            continue
+
+        # Plain `in` checks measured faster than one alternation regex here
+        # ("Half" also covers "1st Half")
+        if "Alt " in market_name or "1st Qtr" in market_name or "Quarter" in market_name or "Half" in market_name:
+            continue
+
+        # " - " is known to be present, so this always splits
+        player_name, _, prop_type = market_name.rpartition(' - ')
+        
+        if "Yes/No" in prop_type:
+            continue
+        
+        kept.append((player_name, prop_type, market))
+    return kept
+
+def runner_american_odds(runner):
+    """A runner's American odds, or None if any level of the odds block is missing"""
+    win_odds = runner.get('winRunnerOdds')
+    display_odds = win_odds.get('americanDisplayOdds') if win_odds else None
+    return display_odds.get('americanOdds') if display_odds else None
+
 def extract_team_name_from_logo(logo_url):
     """Extracts and formats a team name from a FanDuel logo URL."""
     if not logo_url:
@@ -108,6 +165,9 @@ def extract_team_name_from_logo(logo_url):
     except Exception:
         return "Unknown Team"
 
+# Common suffixes (this list can be expanded)
+NAME_SUFFIXES = (' jr', ' sr', ' ii', ' iii', ' iv', ' v')
+
 def normalize_player_name(name):
     """
     Normalizes player names to a standard format for cross-site comparison.
@@ -119,11 +179,12 @@ def normalize_player_name(name):
     name = name.lower().strip()
     # Remove punctuation
     name = name.replace('.', '').replace("'", "")
-    # Remove common suffixes (this list can be expanded)
-    suffixes = [' jr', ' sr', ' ii', ' iii', ' iv', ' v']
-    for suffix in suffixes:
-        if name.endswith(suffix):
-            name = name[:-len(suffix)]
+    # Remove common suffixes; most names have none, so one tuple check
+    # skips the per-suffix loop
+    if name.endswith(NAME_SUFFIXES):
+        for suffix in NAME_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
     
     # Add any other known special cases here
     # special_cases = {
@@ -134,6 +195,40 @@ def normalize_player_name(name):
             
     return name
 
+# Direct matches - this is the most reliable
+PROP_TYPE_MAPPING = {
+    'points': 'points',
+    'rebounds': 'rebounds',
+    'assists': 'assists',
+    'made threes': 'threes',
+    'steals': 'steals',
+    'blocks': 'blocks',
+    'turnovers': 'turnovers',
+    'pts + reb + ast': 'pra',
+    'pts + reb': 'pr',
+    'pts + ast': 'pa',
+    'reb + ast': 'ra',
+    'steals + blocks': 'stocks',
+}
+
+# Fallback for partial matches (less reliable but good), in priority order:
+# combos before the single stats they contain
+PROP_TYPE_FALLBACKS = (
+    ('pts + reb + ast', 'pra'),
+    ('pts + reb', 'pr'),
+    ('pts + ast', 'pa'),
+    ('reb + ast', 'ra'),
+    ('steals + blocks', 'stocks'),
+    ('points', 'points'),
+    ('rebounds', 'rebounds'),
+    ('assists', 'assists'),
+    ('made threes', 'threes'),
+    ('3-point', 'threes'),
+    ('steals', 'steals'),
+    ('blocks', 'blocks'),
+    ('turnovers', 'turnovers'),
+)
+
 def normalize_prop_type(prop_name):
     """Normalizes prop type strings to a standard key."""
     if not prop_name:
@@ -141,49 +236,12 @@ def normalize_prop_type(prop_name):
     
     prop_name_lower = prop_name.lower().strip()
     
-    # Direct matches - this is the most reliable
-    mapping = {
-        'points': 'points',
-        'rebounds': 'rebounds',
-        'assists': 'assists',
-        'made threes': 'threes',
-        'steals': 'steals',
-        'blocks': 'blocks',
-        'turnovers': 'turnovers',
-        'pts + reb + ast': 'pra',
-        'pts + reb': 'pr',
-        'pts + ast': 'pa',
-        'reb + ast': 'ra',
-        'steals + blocks': 'stocks',
-    }
-    if prop_name_lower in mapping:
-        return mapping[prop_name_lower]
+    if prop_name_lower in PROP_TYPE_MAPPING:
+        return PROP_TYPE_MAPPING[prop_name_lower]
     
-    # Fallback for partial matches (less reliable but good)
-    if 'pts + reb + ast' in prop_name_lower:
-        return 'pra'
-    if 'pts + reb' in prop_name_lower:
-        return 'pr'
-    if 'pts + ast' in prop_name_lower:
-        return 'pa'
-    if 'reb + ast' in prop_name_lower:
-        return 'ra'
-    if 'steals + blocks' in prop_name_lower:
-        return 'stocks'
-    if 'points' in prop_name_lower:
-        return 'points'
-    if 'rebounds' in prop_name_lower:
-        return 'rebounds'
-    if 'assists' in prop_name_lower:
-        return 'assists'
-    if 'made threes' in prop_name_lower or '3-point' in prop_name_lower:
-        return 'threes'
-    if 'steals' in prop_name_lower:
-        return 'steals'
-    if 'blocks' in prop_name_lower:
-        return 'blocks'
-    if 'turnovers' in prop_name_lower:
-        return 'turnovers'
+    for needle, prop_type in PROP_TYPE_FALLBACKS:
+        if needle in prop_name_lower:
+            return prop_type
 
     # Fallback: just return a cleaned version
     return prop_name_lower.replace(' ', '_')
@@ -191,8 +249,8 @@ def normalize_prop_type(prop_name):
 def get_upcoming_nba_games(main_page_data, days_ahead=7):
     """
     Parses the main page data to find games scheduled within the next N days.
-    This function now iterates only over the main events attachment, 
-    ensuring no duplicates are returned.
+    This function now iterates only over the main events attachment, a dict
+    keyed by event id, so no event can come up twice.
     """
     attachments = main_page_data.get('attachments', {})
     events_data = attachments.get('events', {})
@@ -202,17 +260,15 @@ def get_upcoming_nba_games(main_page_data, days_ahead=7):
         return []
     
     now_utc = datetime.now(timezone.utc)
+    # The window is the same for every event
+    window_end = now_utc + timedelta(days=days_ahead)
     upcoming_events = []
-    processed_event_ids = set() # Use a set to prevent duplicates
 
     print(f"Parsing {len(events_data)} total events from main page...")
 
     # --- MODIFICATION: Single pass over all events ---
     for event_id, event_detail in events_data.items():
         
-        if event_id in processed_event_ids:
-            continue # Skip if already processed
-            
         # --- MODIFICATION: Stricter check for 'openDate' ---
         open_time_str = event_detail.get('openDate')
         if not open_time_str:
@@ -225,21 +281,26 @@ def get_upcoming_nba_games(main_page_data, days_ahead=7):
         try:
             open_time = datetime.fromisoformat(open_time_str)
             # Check if game is within the specified window
-            if open_time > now_utc and open_time - now_utc < timedelta(days=days_ahead):
+            if now_utc < open_time < window_end:
                 # Only add if it's a valid game with a valid date
                 event_detail['open_time_parsed'] = open_time # Add parsed datetime
                 upcoming_events.append((event_detail, [])) # Market IDs from coupons aren't needed
-                processed_event_ids.add(event_id)
         except ValueError:
             # Skip events with unparseable dates
             print(f"  Warning: Could not parse openDate '{open_time_str}' for event {event_id}. Skipping game.")
     
     return upcoming_events
 
-def run_scraper():
+def run_scraper(session=None, manager=None):
     """Main scraper function that prints all props for upcoming NBA games."""
+    if session is None:
+        with create_session() as session:
+            return run_scraper(session, manager)
+    
+    http_cache = HttpCache('fanduel')
+    
     print("\nFetching all upcoming NBA games...")
-    main_page_data = get_nba_main_page_data()
+    main_page_data = get_nba_main_page_data(session, http_cache)
     
     if not main_page_data:
         print("Could not fetch main page data. Exiting.")
@@ -257,95 +318,115 @@ def run_scraper():
     props_by_date = {}
     games_processed = 0
     
+    games = []
     for event, market_ids in upcoming_events:
         event_id = event['eventId']
         game_name = event['name']
+        # Not a game (e.g. "NBA Specials"): skip before any date work or requests
+        if '@' not in game_name:
+            continue
+        
         open_time_dt = event.get('open_time_parsed')
         
         if not open_time_dt:
             print(f"  Warning: Skipping game {game_name} (ID: {event_id}) due to missing parsed date.")
             continue
             
-        eastern_tz = tz.gettz('America/New_York')
-        local_open_time = open_time_dt.astimezone(eastern_tz)
+        local_open_time = open_time_dt.astimezone(EASTERN_TZ)
         
         game_date_str = local_open_time.strftime('%Y-%m-%d') # <-- MODIFIED
         
-        if '@' not in game_name:
-            continue
+        games.append((event_id, game_name, game_date_str))
+    
+    def discover_tabs(event_id):
+        return get_all_available_tabs(session, event_id, http_cache)
+    
+    def fetch_markets(key):
+        """Each worker filters its page down to the player markets before returning"""
+        return player_markets(get_player_props(session, *key, http_cache))
+    
+    def layout_missed(event_id):
+        """A shared tab has no page for this game, or none of them had any player markets"""
+        pages = [prop_markets[(event_id, tab['name'])] for tab in shared_tabs]
+        return None in pages or not any(pages)
+    
+    # NBA games share (nearly) one tab layout, so instead of fetching every
+    # game's event page for it, the union of a few games' tabs is used for all.
+    # Limitation: a tab that only some games have is found for a game outside
+    # the sample only if that game's layout gets re-discovered below.
+    print(f"Discovering available player prop tabs for {len(games)} games...")
+    # Every page is independent, so fetch them concurrently
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as pool:
+        shared_by_name = {}
+        for available_tabs in pool.map(discover_tabs, [event_id for event_id, _, _ in games[:TAB_SAMPLE_GAMES]]):
+            for tab in available_tabs:
+                shared_by_name.setdefault(tab['name'], tab)
+        shared_tabs = list(shared_by_name.values())
+        tabs_by_game = {event_id: shared_tabs for event_id, _, _ in games}
+        
+        page_keys = [(event_id, tab['name']) for event_id in tabs_by_game for tab in shared_tabs]
+        prop_markets = dict(zip(page_keys, pool.map(fetch_markets, page_keys)))
         
+        # A game the shared layout doesn't fit has one of its own: discover it
+        # and fetch whichever of its tabs weren't tried yet
+        missed = [event_id for event_id in tabs_by_game if layout_missed(event_id)]
+        if missed:
+            print(f"  Re-discovering tabs for {len(missed)} game(s) the shared layout didn't fit")
+        for event_id, own_tabs in zip(missed, pool.map(discover_tabs, missed)):
+            if own_tabs:
+                tabs_by_game[event_id] = own_tabs
+        page_keys = [(event_id, tab['name']) for event_id in missed for tab in tabs_by_game[event_id]
+                     if (event_id, tab['name']) not in prop_markets]
+        prop_markets.update(zip(page_keys, pool.map(fetch_markets, page_keys)))
+    http_cache.save()
+    
+    for event_id, game_name, game_date_str in games:
+        available_tabs = tabs_by_game[event_id]
         games_processed += 1
         
         print(f"\n{'='*80}")
         print(f"GAME: {game_name} (Event ID: {event_id}) - DATE: {game_date_str}")
         print(f"{'='*80}\n")
         
-        if ' @ ' in game_name:
-            away_team = game_name.split(' @ ')[0]
-            home_team = game_name.split(' @ ')[1]
-        else:
+        away_team, sep, home_team = game_name.partition(' @ ')
+        if not sep:
             away_team = "Unknown"
             home_team = "Unknown"
         
-        print(f"Discovering available player prop tabs for {game_name}...")
-        available_tabs = get_all_available_tabs(event_id)
-        
         if not available_tabs:
             print("  No player prop tabs found for this game. Skipping.")
             continue
             
-        print(f"  Found {len(available_tabs)} player prop tabs. Fetching props for each...")
+        print(f"  Found {len(available_tabs)} player prop tabs. Processing props for each...")
         
         for tab in available_tabs:
             tab_name = tab['name']
             tab_title = tab['title']
             
-            print(f"\n--- Fetching '{tab_title}' (tab={tab_name}) ---")
+            print(f"\n--- Props for '{tab_title}' (tab={tab_name}) ---")
             
-            prop_data = get_player_props(event_id, tab_name)
+            markets = prop_markets[(event_id, tab_name)]
             
-            if not prop_data or 'attachments' not in prop_data or 'markets' not in prop_data['attachments']:
+            if markets is None:
                 print(f"  No data available")
                 continue
             
-            markets = prop_data['attachments']['markets']
-            
             if not markets:
                 print(f"  No markets found")
                 continue
             
             prop_count = 0
             
-            for market in markets.values():
-                market_type = market.get('marketType', '')
-                market_name = market.get('marketName', '')
-                
-                if (not market_type.startswith('PLAYER_') or 'TOTAL' not in market_type):
-                    if not (market_type == "PLAYER_PROPS" and "O/U" in market_name):
-                        continue
-                
-                if " - " not in market_name:
-                    continue
-                
-                if "Alt " in market_name or "1st Qtr" in market_name or "1st Half" in market_name or "Quarter" in market_name or "Half" in market_name:
-                    continue
-                
-                try:
-                    player_name, prop_type = market_name.rsplit(' - ', 1)
-                    
-                    if "Yes/No" in prop_type:
-                        continue
-
-                except ValueError:
-                    continue
-
+            for player_name, prop_type, market in markets:
                 runners = market.get('runners', [])
                 
                 if len(runners) != 2:
                     continue
                 
-                over_runner = next((r for r in runners if r.get('result', {}).get('type') == 'OVER'), None)
-                under_runner = next((r for r in runners if r.get('result', {}).get('type') == 'UNDER'), None)
+                # One pass keyed by side (reversed so the first runner of a side wins, as before)
+                runners_by_type = {r.get('result', {}).get('type'): r for r in reversed(runners)}
+                over_runner = runners_by_type.get('OVER')
+                under_runner = runners_by_type.get('UNDER')
                 
                 if not over_runner or not under_runner:
                     continue
@@ -354,8 +435,8 @@ def run_scraper():
                 team_name = extract_team_name_from_logo(logo_url)
                 
                 line = over_runner.get('handicap')
-                over_odds = over_runner.get('winRunnerOdds', {}).get('americanDisplayOdds', {}).get('americanOdds')
-                under_odds = under_runner.get('winRunnerOdds', {}).get('americanDisplayOdds', {}).get('americanOdds')
+                over_odds = runner_american_odds(over_runner)
+                under_odds = runner_american_odds(under_runner)
                 
                 if line is None or over_odds is None or under_odds is None:
                     continue
@@ -364,23 +445,22 @@ def run_scraper():
                 normalized_prop = normalize_prop_type(prop_type)
 
                 # Add game and game_date for consistency with DraftKings
-                prop_info = {
-                    'player': normalized_player,
-                    'team': team_name,
-                    'prop_type': normalized_prop,
-                    'line': line,
-                    'over_odds': over_odds,
-                    'under_odds': under_odds,
-                    'game': game_name,
-                    'game_date': game_date_str,
-                }
+                prop_info = Prop(
+                    player=normalized_player,
+                    team=team_name,
+                    prop_type=normalized_prop,
+                    line=line,
+                    over_odds=over_odds,
+                    under_odds=under_odds,
+                    game=game_name,
+                    game_date=game_date_str,
+                )
                 
-                if game_date_str not in props_by_date:
-                    props_by_date[game_date_str] = []
-                props_by_date[game_date_str].append(prop_info)
+                props_by_date.setdefault(game_date_str, []).append(prop_info)
                 
-                print(f"  {normalized_player} ({team_name}) - {normalized_prop} (Raw: {prop_type})")
-                print(f"    Line: {line} | Over: {over_odds} | Under: {under_odds}")
+                if VERBOSE:
+                    print(f"  {normalized_player} ({team_name}) - {normalized_prop} (Raw: {prop_type})")
+                    print(f"    Line: {line} | Over: {over_odds} | Under: {under_odds}")
                 
                 prop_count += 1
             
@@ -401,7 +481,7 @@ def run_scraper():
     prop_types = {}
     for game_date, props_list in props_by_date.items():
         for prop in props_list:
-            prop_type = prop['prop_type']
+            prop_type = prop.prop_type
             prop_types[prop_type] = prop_types.get(prop_type, 0) + 1
     
     for prop_type, count in sorted(prop_types.items()):
@@ -412,10 +492,12 @@ def run_scraper():
     for game_date, props_list in props_by_date.items():
         all_props.extend(props_list)
     
-    # Use PropsManager instead of manual file writing
-    manager = PropsManager(base_folder="props_data", use_db=True)
-    manager.save_props(all_props, "fanduel")
-    manager.close()
+    # Use PropsManager instead of manual file writing, reusing the caller's if given
+    if manager is not None:
+        manager.save_props(all_props, "fanduel")
+    else:
+        with PropsManager(base_folder="props_data", use_db=True) as manager:
+            manager.save_props(all_props, "fanduel")
     
     print(f"\n✅ FanDuel scraping and saving complete!")
 